@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+"""
+Run the blackbox test suites concurrently, each on its own devices.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from parse_json import test_devices
+
+_CONFIG_DEFAULT = "/etc/stratis/test_config.json"
+_TESTING_DEFAULT = "testing"
+_TESTING_URL = "https://github.com/stratis-storage/testing"
+_CLONE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "cached_clone.py"
+)
+_LOG_DIR_DEFAULT = "blackbox-logs"
+_MIN_DEVICES_DEFAULT = 3
+# The number of devices each suite is given when the suites run one after
+# the other, as in stratis-blackbox-run.sh
+_SERIAL_DEVICES = 3
+
+_DBUS_TIMEOUT = "300000"
+
+# The suites, in the order their results are reported, with the bit each
+# sets in the exit code on failure, as in stratis-blackbox-run.sh.
+_SUITES = [("stratisd_cert", 1), ("stratis_cli_cert", 2)]
+
+# Exit code if there is no test config, as in stratis-blackbox-run.sh
+_NO_CONFIG = 8
+# Exit code if the suites could not be run at all
+_NOT_RUN = 4
+
+
+def gen_parser():
+    """
+    Generate parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the stratisd_cert.py and stratis_cli_cert.py blackbox "
+            "suites concurrently. The devices in the test config are split "
+            "into disjoint groups, one for each suite; if there are too few "
+            "for that, the suites run one after the other on the first "
+            f"{_SERIAL_DEVICES} devices, as stratis-blackbox-run.sh does. "
+            "The suites share the one stratisd, and nothing keeps a suite "
+            "from seeing, or cleaning up, the pools of the other, so a "
+            "failure when they run concurrently should be confirmed with "
+            "--serial. The output of each suite is written to its own log "
+            "file and printed when all suites are done. Exits 1 if "
+            "stratisd_cert failed, 2 if stratis_cli_cert failed, 3 if both "
+            "failed, 4 if the suites could not be run, e.g., because the "
+            "test config has no devices or the testing repo could not be "
+            "cloned, and 8 if there is no test config."
+        )
+    )
+    parser.add_argument(
+        "--config",
+        action="store",
+        default=_CONFIG_DEFAULT,
+        help=f"The test config file (default is {_CONFIG_DEFAULT}).",
+    )
+    parser.add_argument(
+        "--testing-dir",
+        action="store",
+        default=_TESTING_DEFAULT,
+        help=(
+            "Checkout of the testing repo, which is cloned if it does not "
+            f"exist (default is {_TESTING_DEFAULT})."
+        ),
+    )
+    parser.add_argument(
+        "--log-dir",
+        action="store",
+        default=_LOG_DIR_DEFAULT,
+        help=f"Directory for the log of each suite (default is {_LOG_DIR_DEFAULT}).",
+    )
+    parser.add_argument(
+        "--min-devices",
+        action="store",
+        default=_MIN_DEVICES_DEFAULT,
+        type=int,
+        help=(
+            f"Fewest devices a suite may be given (default is {_MIN_DEVICES_DEFAULT})."
+        ),
+    )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help=(
+            "Run the suites one after the other, on the first "
+            f"{_SERIAL_DEVICES} devices."
+        ),
+    )
+    return parser
+
+
+def partition(devices, count, minimum):
+    """
+    Split devices into disjoint groups of nearly equal size, keeping their
+    order.
+
+    :param devices: the devices
+    :type devices: list of str
+    :param int count: the number of groups
+    :param int minimum: the fewest devices in a group
+    :returns: the groups, or None if there are too few devices
+    :rtype: list of list of str or NoneType
+    """
+    if len(devices) < count * minimum:
+        return None
+    (size, extra) = divmod(len(devices), count)
+    starts = [index * size + min(index, extra) for index in range(count + 1)]
+    return [devices[start:end] for (start, end) in zip(starts, starts[1:])]
+
+
+def _command(testing_dir, suite, devices):
+    """
+    The command to run a suite.
+
+    :param str testing_dir: checkout of the testing repo
+    :param str suite: the name of the suite
+    :param devices: the devices for the suite
+    :type devices: list of str
+    :rtype: list of str
+    """
+    return [
+        sys.executable,
+        os.path.join(testing_dir, f"{suite}.py"),
+        "-v",
+        *(arg for device in devices for arg in ("--disk", device)),
+    ]
+
+
+def _run_suites(commands, log_dir, *, concurrent):
+    """
+    Run the suites, each with its output to its own log file.
+
+    :param commands: the command for each suite, by suite
+    :type commands: dict of str * list of str
+    :param str log_dir: the directory for the logs
+    :param bool concurrent: whether to run the suites concurrently
+    :returns: the return code of each suite, by suite
+    :rtype: dict of str * int
+    """
+    env = dict(os.environ, STRATIS_DBUS_TIMEOUT=_DBUS_TIMEOUT)
+
+    processes = {}
+    return_codes = {}
+    try:
+        for suite, command in commands.items():
+            print(f"Executing blackbox test '{' '.join(command)}'...", flush=True)
+            with open(
+                os.path.join(log_dir, f"{suite}.log"), "w", encoding="utf-8"
+            ) as log:
+                processes[suite] = subprocess.Popen(
+                    command, stdout=log, stderr=subprocess.STDOUT, env=env
+                )
+            if not concurrent:
+                return_codes[suite] = processes[suite].wait()
+        for suite, process in processes.items():
+            return_codes[suite] = process.wait()
+    finally:
+        for process in processes.values():
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+
+    return return_codes
+
+
+def _run(args):
+    """
+    Run the suites and report their results.
+
+    :param args: the parsed command-line arguments
+    :returns: the exit code for the suites' results
+    :rtype: int
+    :raises OSError: if the test config or a log can not be read or written
+    :raises RuntimeError: if the test config has no devices
+    :raises ValueError: if the test config is not JSON
+    :raises subprocess.CalledProcessError: if the testing repo can not be
+        cloned
+    """
+    devices = test_devices(args.config)
+    groups = None if args.serial else partition(devices, len(_SUITES), args.min_devices)
+    concurrent = groups is not None
+    if groups is None:
+        groups = [devices[:_SERIAL_DEVICES]] * len(_SUITES)
+        if not args.serial:
+            print(
+                f"{len(devices)} test devices are too few to give each of "
+                f"{len(_SUITES)} suites {args.min_devices}; running the "
+                "suites one after the other."
+            )
+
+    if not os.path.exists(args.testing_dir):
+        subprocess.run([_CLONE, _TESTING_URL, args.testing_dir], check=True)
+
+    os.makedirs(args.log_dir, exist_ok=True)
+
+    print(f"Stratisd dbus timeout: {_DBUS_TIMEOUT}")
+    for (suite, _), group in zip(_SUITES, groups):
+        print(f"Test devices for {suite}: {' '.join(group)}")
+    return_codes = _run_suites(
+        {
+            suite: _command(args.testing_dir, suite, group)
+            for ((suite, _), group) in zip(_SUITES, groups)
+        },
+        args.log_dir,
+        concurrent=concurrent,
+    )
+
+    for suite, _ in _SUITES:
+        print("----------")
+        print(f"Output of {suite}:")
+        with open(os.path.join(args.log_dir, f"{suite}.log"), encoding="utf-8") as log:
+            print(log.read(), end="")
+
+    print("----------")
+    exit_code = 0
+    for suite, failure in _SUITES:
+        result = 0 if return_codes[suite] == 0 else 1
+        print(f"{suite} result: {result}")
+        exit_code |= failure * result
+    return exit_code
+
+
+def main():
+    """
+    Main method
+    """
+
+    parser = gen_parser()
+    args = parser.parse_args()
+
+    if not os.path.exists(args.config):
+        print(
+            f"No test device config found; create {args.config} with the "
+            "devices that can be overwritten for testing."
+        )
+        return _NO_CONFIG
+
+    try:
+        return _run(args)
+    except (OSError, RuntimeError, ValueError, subprocess.CalledProcessError) as err:
+        print(f"Could not run the blackbox suites: {err}", file=sys.stderr)
+        return _NOT_RUN
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,10 +8,10 @@ import json
 import sys
 
 
-def parse_json(path):
+def test_devices(path):
     """
     Opens the provided JSON file and searches for the required key.
-    The return value is a comma-delimited string of device names.
+    The return value is the list of device names.
     """
 
     with open(path, encoding="utf-8") as test_config_file:
@@ -23,7 +23,15 @@ def parse_json(path):
         raise RuntimeError(
             f"Required JSON key 'ok_to_destroy_dev_array_key' is missing in file {path}"
         )
-    print(",".join(ok_to_destroy))
+    return ok_to_destroy
+
+
+def parse_json(path):
+    """
+    Prints the device names in the provided JSON file as a comma-delimited
+    string.
+    """
+    print(",".join(test_devices(path)))
 
 
 if __name__ == "__main__":
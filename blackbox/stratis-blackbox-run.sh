@@ -22,7 +22,7 @@ if [ -d testing ]; then
 	rm -rf testing
 fi
 
-git clone https://github.com/stratis-storage/testing
+../cached_clone.py https://github.com/stratis-storage/testing testing
 
 echo "----------"
 echo "Stratisd dbus timeout: $STRATIS_DBUS_TIMEOUT"
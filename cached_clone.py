@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+"""
+Clone a git repository from a local mirror cache.
+"""
+
+import argparse
+import contextlib
+import fcntl
+import os
+import shutil
+import subprocess
+import sys
+import urllib.parse
+
+_CACHE_ENV = "STRATIS_CLONE_CACHE"
+_OFFLINE_ENV = "STRATIS_CLONE_OFFLINE"
+_CACHE_DEFAULT = os.environ.get(
+    _CACHE_ENV,
+    os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "stratis_clones",
+    ),
+)
+
+
+def gen_parser():
+    """
+    Generate parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Clone a git repository, as 'git clone URL DIRECTORY' does, but "
+            "from a bare mirror of it kept in a cache directory. The mirror "
+            "is made by the first clone, and brought up to date by an "
+            "incremental fetch on each later one, so that only new objects "
+            "are downloaded, and the working tree shares the mirror's "
+            "objects rather than copying them. The mirror of "
+            "https://github.com/OWNER/NAME is OWNER/NAME.git in the cache "
+            "directory."
+        )
+    )
+    parser.add_argument("url", help="The URL of the repository.")
+    parser.add_argument("directory", help="The directory to clone into.")
+    parser.add_argument(
+        "--cache-dir",
+        action="store",
+        default=_CACHE_DEFAULT,
+        help=(
+            "Directory of the mirrors (default is the value of "
+            f"{_CACHE_ENV}, or else {_CACHE_DEFAULT})."
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=bool(os.environ.get(_OFFLINE_ENV)),
+        help=(
+            "Make no network access: clone from the mirror as it is, which "
+            "must already be in the cache directory, e.g., a local mirror "
+            f"made earlier (default is on if {_OFFLINE_ENV} is set)."
+        ),
+    )
+    parser.add_argument(
+        "--branch",
+        action="store",
+        default=None,
+        help="Branch or tag to check out instead of the default branch.",
+    )
+    parser.add_argument(
+        "--method",
+        choices=["reference", "worktree"],
+        default="reference",
+        help=(
+            "How to make the working tree: 'reference', the default, clones "
+            "with --reference to the mirror, so the clone has its own "
+            "branches and an origin remote with the URL; 'worktree' adds a "
+            "git worktree of the mirror, which is faster still, but has a "
+            "detached HEAD, and shares its refs with the mirror. Either way, "
+            "the clone needs the mirror's objects, so the mirror must not "
+            "be removed while the clone is in use."
+        ),
+    )
+    return parser
+
+
+def mirror_path(cache_dir, url):
+    """
+    The path of the mirror of a repository in the cache directory, made
+    from the last two components of its URL, e.g., the owner and name of a
+    GitHub repository.
+
+    :param str cache_dir: the cache directory
+    :param str url: the URL of the repository
+    :rtype: str
+    """
+    path = urllib.parse.urlsplit(url).path.rstrip("/").removesuffix(".git")
+    components = [component for component in path.split("/") if component][-2:]
+    return os.path.join(cache_dir, *components) + ".git"
+
+
+@contextlib.contextmanager
+def _locked(mirror):
+    """
+    Hold an exclusive lock on a mirror, so that concurrent clones neither
+    fetch into it at the same time nor see it half made.
+
+    :param str mirror: the path of the mirror
+    """
+    os.makedirs(os.path.dirname(mirror), exist_ok=True)
+    with open(f"{mirror}.lock", "w", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _git(*args):
+    """
+    Run a git command.
+
+    :param args: the arguments
+    :type args: list of str
+    :raises subprocess.CalledProcessError: if the command fails
+    """
+    subprocess.run(["git", *args], check=True)
+
+
+def update_mirror(mirror, url, *, offline):
+    """
+    Make the mirror of a repository if it does not exist, or else bring it
+    up to date, unless offline.
+
+    The mirror has the branches and tags of the repository, but not other
+    refs, e.g., the refs of GitHub pull requests.
+
+    :param str mirror: the path of the mirror
+    :param str url: the URL of the repository
+    :param bool offline: whether to make no network access
+    :raises RuntimeError: if offline and there is no mirror
+    """
+    if os.path.exists(mirror):
+        if not offline:
+            _git("-C", mirror, "fetch", "--prune", "--tags", "origin")
+        return
+
+    if offline:
+        raise RuntimeError(f"offline, and there is no mirror of {url} at {mirror}")
+
+    partial = f"{mirror}.partial"
+    if os.path.exists(partial):
+        shutil.rmtree(partial)
+    _git("clone", "--bare", url, partial)
+    _git("-C", partial, "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+    os.rename(partial, mirror)
+
+
+def clone(mirror, url, directory, *, branch, method):
+    """
+    Make a working tree of the mirror.
+
+    :param str mirror: the path of the mirror
+    :param str url: the URL of the repository
+    :param str directory: the directory for the working tree
+    :param branch: the branch or tag to check out, or None for the default
+    :type branch: str or NoneType
+    :param str method: "reference" or "worktree"
+    """
+    if method == "worktree":
+        # Forget the worktrees whose directories have been removed since.
+        _git("-C", mirror, "worktree", "prune")
+        _git(
+            "-C",
+            mirror,
+            "worktree",
+            "add",
+            "--detach",
+            os.path.abspath(directory),
+            *([] if branch is None else [branch]),
+        )
+    else:
+        _git(
+            "clone",
+            "--reference",
+            mirror,
+            *([] if branch is None else ["--branch", branch]),
+            mirror,
+            directory,
+        )
+        _git("-C", directory, "remote", "set-url", "origin", url)
+
+
+def main():
+    """
+    Main method
+    """
+
+    parser = gen_parser()
+    args = parser.parse_args()
+
+    if os.path.exists(args.directory):
+        sys.exit(f"{args.directory} already exists")
+
+    mirror = mirror_path(os.path.abspath(args.cache_dir), args.url)
+    try:
+        with _locked(mirror):
+            update_mirror(mirror, args.url, offline=args.offline)
+            clone(
+                mirror, args.url, args.directory, branch=args.branch, method=args.method
+            )
+    except (OSError, RuntimeError, subprocess.CalledProcessError) as err:
+        sys.exit(str(err))
+
+
+if __name__ == "__main__":
+    main()
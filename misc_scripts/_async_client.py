@@ -0,0 +1,78 @@
+"""
+asyncio D-Bus client layer, built from the same introspection data as the
+dbus-python proxy classes.
+
+Every call returns a coroutine, so independent calls can be issued together,
+e.g., with asyncio.gather, and their replies awaited at once rather than
+making one round trip after another.
+"""
+
+import xml.etree.ElementTree as ET
+
+from dbus_next.aio.message_bus import MessageBus
+from dbus_next.constants import BusType
+from dbus_next.introspection import Node
+
+
+async def connect(bus_address=None):
+    """
+    Connect to a bus.
+
+    :param bus_address: address of the bus, or None for the system bus
+    :type bus_address: str or NoneType
+    :returns: the connected bus
+    :rtype: MessageBus
+    """
+    bus = (
+        MessageBus(bus_type=BusType.SYSTEM)
+        if bus_address is None
+        else MessageBus(bus_address=bus_address)
+    )
+    return await bus.connect()
+
+
+def make_node(specs):
+    """
+    Make an introspection node from a map of interface name to interface XML,
+    as in the SPECS of the scripts.
+
+    :param specs: the interface specifications
+    :type specs: dict of str * str
+    :rtype: Node
+    """
+    node = ET.Element("node")
+    node.extend(ET.fromstring(spec) for spec in specs.values())
+    return Node.parse(ET.tostring(node).decode("utf-8"))
+
+
+class ProxyFactory:
+    """
+    Makes proxy interfaces for objects of a single service.
+
+    Methods of a proxy interface are named call_<method>, property getters
+    get_<property>, with names in snake case.
+    """
+
+    def __init__(self, bus, service, specs):
+        """
+        Initializer.
+
+        :param MessageBus bus: the bus
+        :param str service: the service name
+        :param specs: the interface specifications
+        :type specs: dict of str * str
+        """
+        self._bus = bus
+        self._service = service
+        self._node = make_node(specs)
+
+    def interface(self, object_path, interface_name):
+        """
+        Get a proxy interface for an object.
+
+        :param str object_path: the object path
+        :param str interface_name: the interface name
+        """
+        return self._bus.get_proxy_object(
+            self._service, object_path, self._node
+        ).get_interface(interface_name)
@@ -0,0 +1,193 @@
+"""
+dbus-python proxy classes for the scripts, which cost nothing to import.
+
+make_class parses the introspection data and builds a class for each
+interface, and importing dbus_python_client_gen loads into_dbus_python and
+pyparsing, which together take longer than the rest of a script's imports.
+Instead, a script gets its classes from proxy_classes:
+
+* from the module generated ahead of time by generate_proxies.py, for each
+  interface whose introspection data is the same as in the script's SPECS,
+  which are skeletons of the classes, whose methods, made by the functions
+  below, call those of the class make_class builds, or
+* otherwise, from make_class, but only when a class is first used.
+
+In either case, dbus_python_client_gen is not imported, and no class is
+built, until the first method is called.
+"""
+
+import functools
+import importlib
+import re
+
+# The name of the module generated by generate_proxies.py
+GENERATED_MODULE = "_stratisd_proxies"
+
+_REVISION = re.compile(r"r[0-9]+")
+
+
+def class_name(interface_name):
+    """
+    The name of the class for an interface, e.g., ManagerR0 for
+    org.storage.stratis3.Manager.r0 and ObjectManager for
+    org.freedesktop.DBus.ObjectManager.
+
+    :param str interface_name: the interface name
+    :rtype: str
+    """
+    components = interface_name.split(".")
+    if len(components) > 1 and _REVISION.fullmatch(components[-1]):
+        return components[-2][:1].upper() + components[-2][1:] + components[-1].upper()
+    return components[-1][:1].upper() + components[-1][1:]
+
+
+@functools.cache
+def _make_class(interface_name, spec, timeout):
+    """
+    The class make_class builds for an interface, built only once.
+
+    :param str interface_name: the interface name
+    :param str spec: the interface specification, as XML
+    :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    """
+    import xml.etree.ElementTree as ET  # noqa: PLC0415
+
+    from dbus_python_client_gen import make_class  # noqa: PLC0415
+
+    return make_class(class_name(interface_name), ET.fromstring(spec), timeout)
+
+
+def method(interface_name, name, spec, default_timeout):
+    """
+    Make the static method which calls the D-Bus method of the class
+    make_class builds, building it when the method is first called.
+
+    :param str interface_name: the interface name
+    :param str name: the method name
+    :param str spec: the interface specification, as XML
+    :param int default_timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :rtype: staticmethod
+    """
+
+    def dbus_func(proxy_object, func_args, *, timeout=default_timeout):
+        """
+        The method proper.
+
+        :raises DPClientRuntimeError:
+        """
+        return getattr(
+            _make_class(interface_name, spec, default_timeout).Methods, name
+        )(proxy_object, func_args, timeout=timeout)
+
+    return staticmethod(dbus_func)
+
+
+def getter(interface_name, name, spec, default_timeout):
+    """
+    Make the static method which gets the value of a D-Bus property with the
+    class make_class builds, building it when the value is first got.
+
+    :param str interface_name: the interface name
+    :param str name: the property name
+    :param str spec: the interface specification, as XML
+    :param int default_timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :rtype: staticmethod
+    """
+
+    def dbus_func(proxy_object, *, timeout=default_timeout):
+        """
+        The property getter.
+
+        :raises DPClientInvocationError:
+        """
+        return getattr(
+            _make_class(interface_name, spec, default_timeout).Properties, name
+        ).Get(proxy_object, timeout=timeout)
+
+    return staticmethod(dbus_func)
+
+
+def setter(interface_name, name, spec, default_timeout):
+    """
+    Make the static method which sets the value of a D-Bus property with the
+    class make_class builds, building it when the value is first set.
+
+    :param str interface_name: the interface name
+    :param str name: the property name
+    :param str spec: the interface specification, as XML
+    :param int default_timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :rtype: staticmethod
+    """
+
+    def dbus_func(proxy_object, value, *, timeout=default_timeout):
+        """
+        The property setter.
+
+        :raises DPClientRuntimeError:
+        """
+        getattr(
+            _make_class(interface_name, spec, default_timeout).Properties, name
+        ).Set(proxy_object, value, timeout=timeout)
+
+    return staticmethod(dbus_func)
+
+
+class _LazyClass:
+    """
+    Stands in for the class make_class would build, and builds it the first
+    time one of its attributes is looked up.
+    """
+
+    def __init__(self, interface_name, spec, timeout):
+        """
+        Initializer.
+
+        :param str interface_name: the interface name
+        :param str spec: the interface specification, as XML
+        :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+        """
+        self._interface_name = interface_name
+        self._spec = spec
+        self._timeout = timeout
+
+    def __getattr__(self, name):
+        return getattr(
+            _make_class(self._interface_name, self._spec, self._timeout), name
+        )
+
+
+def proxy_classes(specs, interface_names, timeout):
+    """
+    Get the proxy classes for some interfaces, using the generated module
+    for those interfaces for which it is up to date, and building the others
+    when they are first used.
+
+    :param specs: the interface specifications, as in the SPECS of the scripts
+    :type specs: dict of str * str
+    :param interface_names: the interfaces to get classes for
+    :type interface_names: list of str
+    :param int timeout: D-Bus timeout, -1 is libdbus default ~25s
+    :returns: a class for each interface, in order
+    :rtype: list
+    """
+    try:
+        generated = importlib.import_module(GENERATED_MODULE)
+    except ImportError:
+        generated_classes = {}
+    else:
+        generated_classes = (
+            {
+                interface_name: klass
+                for (interface_name, klass) in generated.CLASSES.items()
+                if generated.SPECS[interface_name] == specs.get(interface_name)
+            }
+            if generated.TIMEOUT == timeout
+            else {}
+        )
+
+    return [
+        generated_classes[interface_name]
+        if interface_name in generated_classes
+        else _LazyClass(interface_name, specs[interface_name], timeout)
+        for interface_name in interface_names
+    ]
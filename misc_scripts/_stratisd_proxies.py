@@ -0,0 +1,291 @@
+"""
+dbus-python proxy classes, generated by generate_proxies.py from
+filesystem_size_estimate.py, update_introspection_data.py. Do not edit.
+"""
+
+from _proxies import getter, method, setter
+
+TIMEOUT = 120000
+
+SPECS = {
+    "org.freedesktop.DBus.Introspectable": """
+<interface name="org.freedesktop.DBus.Introspectable">
+<method name="Introspect">
+<arg name="xml_data" type="s" direction="out"/>
+</method>
+</interface>
+""",
+    "org.freedesktop.DBus.ObjectManager": """
+<interface name="org.freedesktop.DBus.ObjectManager">
+<method name="GetManagedObjects">
+<arg name="objpath_interfaces_and_properties" type="a{oa{sa{sv}}}" direction="out"/>
+</method>
+</interface>
+""",
+    "org.freedesktop.DBus.Properties": """
+<interface name="org.freedesktop.DBus.Properties">
+<signal name="PropertiesChanged">
+<arg name="interface_name" type="s"/>
+<arg name="changed_properties" type="a{sv}"/>
+<arg name="invalidated_properties" type="as"/>
+</signal>
+</interface>
+""",
+    "org.storage.stratis3.Manager.r0": """
+<interface name="org.storage.stratis3.Manager.r0">
+<method name="CreatePool">
+<arg name="name" type="s" direction="in"/>
+<arg name="redundancy" type="(bq)" direction="in"/>
+<arg name="devices" type="as" direction="in"/>
+<arg name="key_desc" type="(bs)" direction="in"/>
+<arg name="clevis_info" type="(b(ss))" direction="in" />
+<arg name="result" type="(b(oao))" direction="out"/>
+<arg name="return_code" type="q" direction="out"/>
+<arg name="return_string" type="s" direction="out"/>
+</method>
+<method name="DestroyPool">
+<arg name="pool" type="o" direction="in" />
+<arg name="result" type="(bs)" direction="out" />
+<arg name="return_code" type="q" direction="out" />
+<arg name="return_string" type="s" direction="out" />
+</method>
+<property name="Version" type="s" access="read">
+<annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" value="const" />
+</property>
+</interface>
+""",
+    "org.storage.stratis3.filesystem.r0": """
+<interface name="org.storage.stratis3.filesystem.r0">
+    <property name="Created" type="s" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" value="const" />
+    </property>
+    <property name="Devnode" type="s" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" value="invalidates" />
+    </property>
+    <property name="Name" type="s" access="read" />
+    <property name="Pool" type="o" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" value="const" />
+    </property>
+    <property name="Size" type="s" access="read" />
+    <property name="Used" type="(bs)" access="read" />
+    <property name="Uuid" type="s" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" value="const" />
+    </property>
+  </interface>
+""",
+    "org.storage.stratis3.pool.r0": """
+<interface name="org.storage.stratis3.pool.r0">
+<method name="CreateFilesystems">
+<arg name="specs" type="a(s(bs))" direction="in"/>
+<arg name="results" type="(ba(os))" direction="out"/>
+<arg name="return_code" type="q" direction="out"/>
+<arg name="return_string" type="s" direction="out"/>
+</method>
+<method name="DestroyFilesystems">
+<arg name="filesystems" type="ao" direction="in" />
+<arg name="results" type="(bas)" direction="out" />
+<arg name="return_code" type="q" direction="out" />
+<arg name="return_string" type="s" direction="out" />
+</method>
+<property name="Name" type="s" access="read" />
+<property name="TotalPhysicalSize" type="s" access="read" />
+<property name="TotalPhysicalUsed" type="(bs)" access="read" />
+</interface>
+""",
+}
+
+
+class Introspectable:
+    """
+    org.freedesktop.DBus.Introspectable
+    """
+
+    class Methods:
+        Introspect = method(
+            "org.freedesktop.DBus.Introspectable",
+            "Introspect",
+            SPECS["org.freedesktop.DBus.Introspectable"],
+            TIMEOUT,
+        )
+
+    class Properties:
+        pass
+
+
+class ObjectManager:
+    """
+    org.freedesktop.DBus.ObjectManager
+    """
+
+    class Methods:
+        GetManagedObjects = method(
+            "org.freedesktop.DBus.ObjectManager",
+            "GetManagedObjects",
+            SPECS["org.freedesktop.DBus.ObjectManager"],
+            TIMEOUT,
+        )
+
+    class Properties:
+        pass
+
+
+class Properties:
+    """
+    org.freedesktop.DBus.Properties
+    """
+
+    class Methods:
+        pass
+
+    class Properties:
+        pass
+
+
+class ManagerR0:
+    """
+    org.storage.stratis3.Manager.r0
+    """
+
+    class Methods:
+        CreatePool = method(
+            "org.storage.stratis3.Manager.r0",
+            "CreatePool",
+            SPECS["org.storage.stratis3.Manager.r0"],
+            TIMEOUT,
+        )
+        DestroyPool = method(
+            "org.storage.stratis3.Manager.r0",
+            "DestroyPool",
+            SPECS["org.storage.stratis3.Manager.r0"],
+            TIMEOUT,
+        )
+
+    class Properties:
+        class Version:
+            Get = getter(
+                "org.storage.stratis3.Manager.r0",
+                "Version",
+                SPECS["org.storage.stratis3.Manager.r0"],
+                TIMEOUT,
+            )
+
+
+class FilesystemR0:
+    """
+    org.storage.stratis3.filesystem.r0
+    """
+
+    class Methods:
+        pass
+
+    class Properties:
+        class Created:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Created",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+        class Devnode:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Devnode",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+        class Name:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Name",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+        class Pool:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Pool",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+        class Size:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Size",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+        class Used:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Used",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+        class Uuid:
+            Get = getter(
+                "org.storage.stratis3.filesystem.r0",
+                "Uuid",
+                SPECS["org.storage.stratis3.filesystem.r0"],
+                TIMEOUT,
+            )
+
+
+class PoolR0:
+    """
+    org.storage.stratis3.pool.r0
+    """
+
+    class Methods:
+        CreateFilesystems = method(
+            "org.storage.stratis3.pool.r0",
+            "CreateFilesystems",
+            SPECS["org.storage.stratis3.pool.r0"],
+            TIMEOUT,
+        )
+        DestroyFilesystems = method(
+            "org.storage.stratis3.pool.r0",
+            "DestroyFilesystems",
+            SPECS["org.storage.stratis3.pool.r0"],
+            TIMEOUT,
+        )
+
+    class Properties:
+        class Name:
+            Get = getter(
+                "org.storage.stratis3.pool.r0",
+                "Name",
+                SPECS["org.storage.stratis3.pool.r0"],
+                TIMEOUT,
+            )
+
+        class TotalPhysicalSize:
+            Get = getter(
+                "org.storage.stratis3.pool.r0",
+                "TotalPhysicalSize",
+                SPECS["org.storage.stratis3.pool.r0"],
+                TIMEOUT,
+            )
+
+        class TotalPhysicalUsed:
+            Get = getter(
+                "org.storage.stratis3.pool.r0",
+                "TotalPhysicalUsed",
+                SPECS["org.storage.stratis3.pool.r0"],
+                TIMEOUT,
+            )
+
+
+CLASSES = {
+    "org.freedesktop.DBus.Introspectable": Introspectable,
+    "org.freedesktop.DBus.ObjectManager": ObjectManager,
+    "org.freedesktop.DBus.Properties": Properties,
+    "org.storage.stratis3.Manager.r0": ManagerR0,
+    "org.storage.stratis3.filesystem.r0": FilesystemR0,
+    "org.storage.stratis3.pool.r0": PoolR0,
+}
@@ -0,0 +1,145 @@
+"""
+Sweeps of integer input values, e.g., filesystem or pool sizes, shared by the
+measurement scripts.
+
+Each kind of sweep is a sorted sequence of distinct integers, a NumPy array
+for every kind but geometric, which is a list, so that the default sweep of
+filesystem_size_input.py does not need NumPy. NumPy is only imported when a
+sweep which needs it is made. A sweep can be specified on the command line
+as KIND:ARGS, where ARGS are comma-separated integers, e.g.,
+"geometric:536870912,8796093022208" or "refine:1073741824,268435456,6"; see
+KINDS.
+"""
+
+import itertools
+
+
+def linear(start, stop, intervals):
+    """
+    Values from start, in equal integer steps, dividing the range from start
+    to stop into the given number of intervals.
+
+    :param int start: the first value
+    :param int stop: the value to end at or just past
+    :param int intervals: the number of intervals
+    :rtype: numpy.ndarray
+    :raises ValueError: if the step is not positive
+    """
+    import numpy  # noqa: PLC0415
+
+    step = (stop - start) // intervals if intervals > 0 else 0
+    if step <= 0:
+        raise ValueError(f"increment is {step} which is not a positive number")
+    return numpy.arange(start, stop + step, step, dtype=numpy.int64)
+
+
+def geometric(start, stop, ratio=2):
+    """
+    Values from start up to stop, each ratio times the last.
+
+    :param int start: the first value
+    :param int stop: the value to end at
+    :param int ratio: the ratio between consecutive values
+    :rtype: list of int
+    :raises ValueError: if start or ratio make no progress
+    """
+    if start <= 0 or ratio <= 1:
+        raise ValueError(
+            f"start {start} and ratio {ratio} do not make an increasing sequence"
+        )
+    values = []
+    value = start
+    while value <= stop:
+        values.append(value)
+        value *= ratio
+    return values
+
+
+def log_uniform(start, stop, intervals):
+    """
+    Values from start to stop, rounded to integers, dividing the range into
+    the given number of intervals of equal ratio. Values which coincide
+    after rounding are only included once.
+
+    :param int start: the first value
+    :param int stop: the last value
+    :param int intervals: the number of intervals
+    :rtype: numpy.ndarray
+    :raises ValueError: if the range is not a valid range for a log scale
+    """
+    import numpy  # noqa: PLC0415
+
+    if start <= 0 or stop <= start or intervals <= 0:
+        raise ValueError(f"{start},{stop},{intervals} is not a valid log scale range")
+    return numpy.unique(
+        numpy.rint(numpy.geomspace(start, stop, intervals + 1)).astype(numpy.int64)
+    )
+
+
+def refinement(center, width, count):
+    """
+    Values clustered around a breakpoint, e.g., a size at which the
+    measured value was seen to jump: the breakpoint, and values at width,
+    width/2, width/4, and so on, on either side of it, count on each side.
+    Only positive values are included.
+
+    :param int center: the breakpoint to refine around
+    :param int width: the largest distance from the breakpoint
+    :param int count: the number of values on either side
+    :rtype: numpy.ndarray
+    """
+    import numpy  # noqa: PLC0415
+
+    offsets = [width >> shift for shift in range(count) if width >> shift > 0]
+    values = numpy.array(
+        [center] + [center + sign * offset for offset in offsets for sign in (-1, 1)],
+        dtype=numpy.int64,
+    )
+    return numpy.unique(values[values > 0])
+
+
+KINDS = {
+    "linear": linear,
+    "geometric": geometric,
+    "log-uniform": log_uniform,
+    "refine": refinement,
+}
+
+
+def parse(spec):
+    """
+    Make a sweep from its specification.
+
+    :param str spec: KIND:ARGS, where KIND is a key of KINDS
+    :rtype: numpy.ndarray or list of int
+    :raises ValueError: if the specification is invalid
+    """
+    (kind, _, args) = spec.partition(":")
+    if kind not in KINDS:
+        raise ValueError(
+            f"unknown sweep kind {kind!r} in {spec!r}, must be one of "
+            f"{', '.join(KINDS)}"
+        )
+    try:
+        return KINDS[kind](*(int(arg) for arg in args.split(",")))
+    except TypeError as err:
+        raise ValueError(f"wrong number of arguments in {spec!r}") from err
+
+
+def unique(sweeps, measured=()):
+    """
+    Chain sweeps lazily, leaving out any value already produced or already
+    measured.
+
+    :param sweeps: the sweeps
+    :type sweeps: iterable of iterable of int
+    :param measured: values that have already been measured
+    :type measured: iterable of int
+    :returns: the values, in order of first appearance
+    :rtype: generator of int
+    """
+    seen = {int(value) for value in measured}
+    for value in map(int, itertools.chain.from_iterable(sweeps)):
+        if value not in seen:
+            seen.add(value)
+            yield value
@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+"""
+Check the diff of interface revisions made by update_introspection_data.py.
+"""
+
+import argparse
+import sys
+import xml.etree.ElementTree as ET
+
+from update_introspection_data import _interface_diff
+
+# Each case is a description, two revisions of an interface, and whether
+# they should differ.
+CASES = [
+    (
+        "signal whose arg type changes",
+        """
+<interface name="i">
+<signal name="NameOwnerChanged">
+<arg name="name" type="s"/>
+<arg name="old_owner" type="s"/>
+</signal>
+</interface>
+""",
+        """
+<interface name="i">
+<signal name="NameOwnerChanged">
+<arg name="name" type="s"/>
+<arg name="old_owner" type="o"/>
+</signal>
+</interface>
+""",
+        True,
+    ),
+    (
+        "signal which gains an arg",
+        """
+<interface name="i">
+<signal name="Changed">
+<arg name="name" type="s"/>
+</signal>
+</interface>
+""",
+        """
+<interface name="i">
+<signal name="Changed">
+<arg name="name" type="s"/>
+<arg name="value" type="v"/>
+</signal>
+</interface>
+""",
+        True,
+    ),
+    (
+        "signal which is the same",
+        """
+<interface name="i">
+<signal name="Changed">
+<arg name="name" type="s"/>
+</signal>
+</interface>
+""",
+        """
+<interface name="i">
+<signal name="Changed">
+<arg type="s" name="name"/>
+</signal>
+</interface>
+""",
+        False,
+    ),
+    (
+        "method arg with no direction, which is in",
+        """
+<interface name="i">
+<method name="Create">
+<arg name="name" type="s"/>
+<arg name="result" type="b" direction="out"/>
+</method>
+</interface>
+""",
+        """
+<interface name="i">
+<method name="Create">
+<arg name="name" type="s" direction="in"/>
+<arg name="result" type="b" direction="out"/>
+</method>
+</interface>
+""",
+        False,
+    ),
+    (
+        "method whose in arg type changes",
+        """
+<interface name="i">
+<method name="Create">
+<arg name="name" type="s" direction="in"/>
+</method>
+</interface>
+""",
+        """
+<interface name="i">
+<method name="Create">
+<arg name="name" type="as" direction="in"/>
+</method>
+</interface>
+""",
+        True,
+    ),
+    (
+        "property whose access changes",
+        """
+<interface name="i">
+<property name="Name" type="s" access="read"/>
+</interface>
+""",
+        """
+<interface name="i">
+<property name="Name" type="s" access="readwrite"/>
+</interface>
+""",
+        True,
+    ),
+]
+
+
+def main():
+    """
+    Main function
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Diff pairs of revisions of an interface, as the revisions "
+            "subcommand of update_introspection_data.py does, and fail if "
+            "any pair is reported as changed when it is the same, or as the "
+            "same when it is changed."
+        )
+    )
+    parser.parse_args()
+
+    failed = False
+    for description, old, new, changed in CASES:
+        diff = _interface_diff(ET.fromstring(old), ET.fromstring(new))
+        ok = bool(diff) == changed
+        print(f"{'ok' if ok else 'FAILED'}: {description}")
+        for line in diff:
+            print(f"    {line}")
+        failed = failed or not ok
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
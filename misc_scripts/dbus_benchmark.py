@@ -0,0 +1,284 @@
+#!/usr/bin/python3
+"""
+Measure the latency of stratisd D-Bus methods and properties.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import dbus
+import numpy
+from filesystem_size_estimate import Filesystem, Manager, Pool
+
+_SERVICE = "org.storage.stratis3"
+_TOP_OBJECT = "/org/storage/stratis3"
+
+
+def gen_parser():
+    """
+    Generate parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Repeatedly create a pool and a filesystem, read their properties, "
+            "and destroy them, and print the latency percentiles and "
+            "throughput of each D-Bus call as JSON. Run against stratisd "
+            "--sim on a private bus, e.g., with private_bus.py, which needs "
+            "no devices, nor root permissions where unprivileged user "
+            "namespaces are enabled."
+        )
+    )
+    parser.add_argument(
+        "--iterations",
+        action="store",
+        default=100,
+        type=int,
+        help="Total number of iterations, over all workers.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        action="store",
+        default=1,
+        type=int,
+        help="Number of workers, each with its own bus connection.",
+    )
+    parser.add_argument(
+        "--bus-address",
+        action="store",
+        default=None,
+        dest="bus_address",
+        help="Address of the bus to connect to instead of the system bus.",
+    )
+    return parser
+
+
+class _Recorder:
+    """
+    Collects the latencies of calls, by operation, from several threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+
+    def call(self, name, func, *args):
+        """
+        Call a function and record how long it took.
+
+        :param str name: the name of the operation
+        :param func: the function to call
+        :returns: the result of the function
+        """
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies[name].append(elapsed)
+        return result
+
+
+def _check(result):
+    """
+    Check the return code of a stratisd method.
+
+    :param result: the result of a stratisd method
+    :returns: the first item of the result
+    :raises RuntimeError: if the return code is not 0
+    """
+    (value, return_code, return_msg) = result
+    if return_code != 0:
+        raise RuntimeError(return_msg)
+    return value
+
+
+def _clean_up(bus, pool_object_path, filesystem_object_path):
+    """
+    Destroy the filesystem and the pool left behind by an iteration that
+    failed, so that their names can be used again. A failure to destroy
+    either is reported, but not raised, so that it does not hide the
+    failure of the iteration.
+
+    :param bus: the bus connection
+    :param pool_object_path: object path of the pool, or None
+    :type pool_object_path: str or NoneType
+    :param filesystem_object_path: object path of the filesystem, or None
+    :type filesystem_object_path: str or NoneType
+    """
+    try:
+        if filesystem_object_path is not None:
+            _check(
+                Pool.Methods.DestroyFilesystems(
+                    bus.get_object(_SERVICE, pool_object_path, introspect=False),
+                    {"filesystems": [filesystem_object_path]},
+                )
+            )
+        if pool_object_path is not None:
+            _check(
+                Manager.Methods.DestroyPool(
+                    bus.get_object(_SERVICE, _TOP_OBJECT, introspect=False),
+                    {"pool": pool_object_path},
+                )
+            )
+    except Exception as err:
+        print(f"Could not clean up after a failed iteration: {err}", file=sys.stderr)
+
+
+def _iteration(bus, recorder, index):
+    """
+    Create a pool and a filesystem, read their properties, and destroy them.
+    If a call fails, whatever was created and not yet destroyed is destroyed
+    before the failure is raised.
+
+    :param bus: the bus connection
+    :param _Recorder recorder: the latency recorder
+    :param int index: the iteration number, used to make unique names
+    """
+    proxy = bus.get_object(_SERVICE, _TOP_OBJECT, introspect=False)
+
+    (pool_object_path, filesystem_object_path) = (None, None)
+    try:
+        (_, (pool_object_path, _)) = _check(
+            recorder.call(
+                "CreatePool",
+                Manager.Methods.CreatePool,
+                proxy,
+                {
+                    "name": f"bench_pool_{index}",
+                    "redundancy": (True, 0),
+                    "devices": [f"/dev/bench_{index}"],
+                    "key_desc": (False, ""),
+                    "clevis_info": (False, ("", "")),
+                },
+            )
+        )
+        pool_proxy = bus.get_object(_SERVICE, pool_object_path, introspect=False)
+
+        recorder.call(
+            "Get TotalPhysicalUsed", Pool.Properties.TotalPhysicalUsed.Get, pool_proxy
+        )
+
+        (_, filesystems) = _check(
+            recorder.call(
+                "CreateFilesystems",
+                Pool.Methods.CreateFilesystems,
+                pool_proxy,
+                {"specs": [("bench_fs", (False, ""))]},
+            )
+        )
+        filesystem_object_path = filesystems[0][0]
+        filesystem_proxy = bus.get_object(
+            _SERVICE, filesystem_object_path, introspect=False
+        )
+
+        recorder.call("Get Used", Filesystem.Properties.Used.Get, filesystem_proxy)
+
+        _check(
+            recorder.call(
+                "DestroyFilesystems",
+                Pool.Methods.DestroyFilesystems,
+                pool_proxy,
+                {"filesystems": [filesystem_object_path]},
+            )
+        )
+        filesystem_object_path = None
+
+        _check(
+            recorder.call(
+                "DestroyPool",
+                Manager.Methods.DestroyPool,
+                proxy,
+                {"pool": pool_object_path},
+            )
+        )
+        pool_object_path = None
+    finally:
+        _clean_up(bus, pool_object_path, filesystem_object_path)
+
+
+def _worker(bus_address, recorder, counter, iterations):
+    """
+    Run iterations until the total number has been started.
+
+    :param bus_address: address of the bus, or None for the system bus
+    :type bus_address: str or NoneType
+    :param _Recorder recorder: the latency recorder
+    :param counter: shared source of iteration numbers
+    :param int iterations: total number of iterations
+    """
+    bus = dbus.bus.BusConnection(
+        dbus.bus.BUS_SYSTEM if bus_address is None else bus_address
+    )
+    try:
+        while (index := next(counter)) < iterations:
+            _iteration(bus, recorder, index)
+    finally:
+        bus.close()
+
+
+def _summarize(latencies, elapsed):
+    """
+    Summarize the latencies of each operation.
+
+    :param latencies: latencies in seconds, by operation
+    :type latencies: dict of str * list of float
+    :param float elapsed: wall time of the whole run in seconds
+    :returns: percentiles in ms and throughput in calls/s, by operation
+    :rtype: dict of str * dict
+    """
+    summary = {}
+    for name, values in latencies.items():
+        (p50, p95, p99) = numpy.percentile(numpy.array(values) * 1000, [50, 95, 99])
+        summary[name] = {
+            "count": len(values),
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "throughput_per_s": len(values) / elapsed,
+        }
+    return summary
+
+
+def main():
+    """
+    Main method
+    """
+
+    parser = gen_parser()
+    args = parser.parse_args()
+
+    recorder = _Recorder()
+    counter = itertools.count()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [
+            executor.submit(
+                _worker, args.bus_address, recorder, counter, args.iterations
+            )
+            for _ in range(args.concurrency)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "iterations": args.iterations,
+                "concurrency": args.concurrency,
+                "elapsed_s": elapsed,
+                "operations": _summarize(recorder.latencies, elapsed),
+            },
+            indent=4,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
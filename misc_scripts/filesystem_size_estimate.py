@@ -4,12 +4,20 @@ Estimate filesystem size consumption for logical filesystem sizes.
 """
 
 import argparse
+import contextlib
+import csv
+import datetime
+import json
+import os
+import signal
 import sys
-import xml.etree.ElementTree as ET
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import _sweep
 import dbus
-
-from dbus_python_client_gen import make_class
+from _proxies import proxy_classes
 
 # a minimal chunk of introspection data, enough for the methods needed.
 SPECS = {
@@ -19,6 +27,22 @@ SPECS = {
 <arg name="xml_data" type="s" direction="out"/>
 </method>
 </interface>
+""",
+    "org.freedesktop.DBus.ObjectManager": """
+<interface name="org.freedesktop.DBus.ObjectManager">
+<method name="GetManagedObjects">
+<arg name="objpath_interfaces_and_properties" type="a{oa{sa{sv}}}" direction="out"/>
+</method>
+</interface>
+""",
+    "org.freedesktop.DBus.Properties": """
+<interface name="org.freedesktop.DBus.Properties">
+<signal name="PropertiesChanged">
+<arg name="interface_name" type="s"/>
+<arg name="changed_properties" type="a{sv}"/>
+<arg name="invalidated_properties" type="as"/>
+</signal>
+</interface>
 """,
     "org.storage.stratis3.Manager.r0": """
 <interface name="org.storage.stratis3.Manager.r0">
@@ -57,6 +81,8 @@ SPECS = {
 <arg name="return_code" type="q" direction="out" />
 <arg name="return_string" type="s" direction="out" />
 </method>
+<property name="Name" type="s" access="read" />
+<property name="TotalPhysicalSize" type="s" access="read" />
 <property name="TotalPhysicalUsed" type="(bs)" access="read" />
 </interface>
 """,
@@ -84,15 +110,41 @@ SPECS = {
 _SERVICE = "org.storage.stratis3"
 _TOP_OBJECT = "/org/storage/stratis3"
 
+_OBJECT_MANAGER_IFACE = "org.freedesktop.DBus.ObjectManager"
+_PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
 _MANAGER_IFACE = "org.storage.stratis3.Manager.r0"
 _POOL_IFACE = "org.storage.stratis3.pool.r0"
 _FILESYSTEM_IFACE = "org.storage.stratis3.filesystem.r0"
 
+_POOL_NAME = "pool_name"
+
 _TIMEOUT = 120000
 
-Manager = make_class("Manager", ET.fromstring(SPECS[_MANAGER_IFACE]), _TIMEOUT)
-Pool = make_class("Pool", ET.fromstring(SPECS[_POOL_IFACE]), _TIMEOUT)
-Filesystem = make_class("Filesystem", ET.fromstring(SPECS[_FILESYSTEM_IFACE]), _TIMEOUT)
+# Seconds to wait for a signal of the pool's usage changing after
+# filesystems are destroyed, before reading it instead
+_USAGE_CHANGE_TIMEOUT = 0.02
+
+# Fields of the samples file, each an array with one element per sample
+_SAMPLE_FIELDS = ["size", "trial", "fs_used", "pool_used_pre", "pool_used_post"]
+
+# Fields of a row in the jsonl and csv formats
+_FIELDS = [
+    "size",
+    "trial",
+    "fs_used",
+    "pool_used_pre",
+    "pool_used_post",
+    "timestamp",
+    "create_s",
+    "properties_s",
+    "destroy_s",
+]
+
+(ObjectManager, Manager, Pool, Filesystem) = proxy_classes(
+    SPECS,
+    [_OBJECT_MANAGER_IFACE, _MANAGER_IFACE, _POOL_IFACE, _FILESYSTEM_IFACE],
+    _TIMEOUT,
+)
 
 
 def gen_parser():
@@ -106,7 +158,9 @@ def gen_parser():
             "for the first column are read from stdin and must be in bytes. "
             "The values for the second column are in bytes. This script must "
             "be run with root permissions. stratisd must have already been "
-            "started. Pool 'pool_name' must not have been created."
+            "started. The pools are named 'pool_name', 'pool_name_1', and so "
+            "on. If such a pool already exists, it is reused, having been "
+            "left behind by an interrupted run."
         )
     )
     parser.add_argument(
@@ -116,67 +170,657 @@ def gen_parser():
         type=str,
         help="Devices with which to instantiate the pool.",
     )
+    parser.add_argument(
+        "--device-group",
+        action="append",
+        default=[],
+        dest="device_groups",
+        nargs="+",
+        type=str,
+        help=(
+            "Devices with which to instantiate an additional pool. May be "
+            "given more than once. The sizes are shared out among the pools, "
+            "which are measured concurrently, and the rows are printed in "
+            "the same order as with a single pool."
+        ),
+    )
+    parser.add_argument(
+        "--test-config",
+        action="store",
+        default=None,
+        dest="test_config",
+        help=(
+            "Stratis test config file, from whose ok_to_destroy_dev_array_key "
+            "list to take devices for additional pools, --group-size "
+            "devices to a pool."
+        ),
+    )
+    parser.add_argument(
+        "--group-size",
+        action="store",
+        default=1,
+        dest="group_size",
+        type=int,
+        help="Number of devices in each pool made from --test-config.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        action="store",
+        default=1,
+        dest="batch_size",
+        type=int,
+        help=(
+            "Maximum number of filesystems in a batch. The filesystems of a "
+            "batch are created one per D-Bus call, as stratisd allows no "
+            "more, then measured together and destroyed with a single D-Bus "
+            "call. A batch is also limited so that the sum of its filesystem "
+            "sizes does not exceed the pool's physical size. Pool usage is "
+            "measured before and after each batch."
+        ),
+    )
+    parser.add_argument(
+        "--bus-address",
+        action="store",
+        default=None,
+        dest="bus_address",
+        help="Address of the bus to connect to instead of the system bus.",
+    )
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        default=False,
+        help=(
+            "Use the asyncio D-Bus client, which makes independent D-Bus "
+            "calls concurrently."
+        ),
+    )
+    parser.add_argument(
+        "--managed-objects",
+        action="store_true",
+        default=False,
+        dest="managed_objects",
+        help=(
+            "Read all pool and filesystem properties for a batch with a "
+            "single GetManagedObjects call, and track pool usage between "
+            "batches from PropertiesChanged signals. The pool's usage "
+            "before a batch is read after the previous batch's filesystems "
+            "were destroyed, unless a change to it is signalled within "
+            f"{_USAGE_CHANGE_TIMEOUT} seconds of the destroy. Implies "
+            "--asyncio."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        action="store",
+        choices=["text", "jsonl", "csv"],
+        default="text",
+        help=(
+            "Output format. The jsonl and csv formats add a timestamp and "
+            "the latencies of the D-Bus calls for each row."
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store",
+        default=None,
+        help=(
+            "File in which to record the sizes measured. Sizes recorded in "
+            "it by a previous run are skipped."
+        ),
+    )
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        dest="sweeps",
+        help=(
+            "Sweep of sizes to measure, as KIND:ARGS, instead of reading "
+            "them from stdin. May be given more than once; a size is only "
+            "measured once however many sweeps include it. See "
+            "filesystem_size_input.py --help for the kinds of sweep."
+        ),
+    )
+    parser.add_argument(
+        "--trials",
+        action="store",
+        default=1,
+        type=int,
+        help=(
+            "Number of times to measure each size. Every size is measured "
+            "once per trial, in alternate directions in alternate trials. "
+            "If more than 1, statistics of the filesystem's usage and of the "
+            "increase in the pool's usage for each size are printed to "
+            "stderr at the end. The increase in the pool's usage is for the "
+            "whole batch."
+        ),
+    )
+    parser.add_argument(
+        "--samples",
+        action="store",
+        default=None,
+        help=(
+            "NumPy .npz file in which to save the samples, with one array "
+            "for each of size, trial, fs_used, pool_used_pre and "
+            "pool_used_post, on exit. Used with --checkpoint, the samples "
+            "are also recorded in the checkpoint as they are measured, and "
+            "those of a previous run, even one that was killed, are kept."
+        ),
+    )
     return parser
 
 
-def _do_one(size, bus, pool_proxy):
+@contextlib.contextmanager
+def _timed(latencies, name):
+    """
+    Add the time spent in the body of the with statement to a latency.
+
+    :param latencies: latencies in seconds, by operation
+    :type latencies: dict of str * float
+    :param str name: the name of the operation
     """
-    Get data for specified size.
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        latencies[name] = latencies.get(name, 0.0) + time.perf_counter() - start
 
-    :param str size: filesystem size to specify
+
+def _do_batch(sizes, bus, pool_proxy):
+    """
+    Get data for specified sizes, creating the filesystems one at a time,
+    then reading their usage and destroying them all together.
+
+    :param sizes: filesystem sizes to specify
+    :type sizes: list of str
     :param bus: system bus
     :param pool_proxy: proxy to invoke methods on pool
-    :returns: a 4-tuple of values
-    :rtype: (str, srt or NoneType, str or NoneType, str or NoneType)
+    :returns: a 4-tuple of values for each size, and the latencies of the
+        D-Bus calls in seconds
+    :rtype: (list of (str, srt or NoneType, str or NoneType, str or NoneType))
+        * (dict of str * float)
     """
-    (real, pool_used_pre) = Pool.Properties.TotalPhysicalUsed.Get(pool_proxy)
+    latencies = {}
+
+    with _timed(latencies, "properties_s"):
+        (real, pool_used_pre) = Pool.Properties.TotalPhysicalUsed.Get(pool_proxy)
     if not real:
         pool_used_pre = None
 
-    ((_, (filesystems)), return_code, return_msg) = Pool.Methods.CreateFilesystems(
-        pool_proxy, {"specs": [("fs_name", (True, size))]}
-    )
+    # stratisd creates at most one filesystem per CreateFilesystems call.
+    names = [f"fs_name_{index}" for index in range(len(sizes))]
+    filesystems = []
+    for name, size in zip(names, sizes):
+        with _timed(latencies, "create_s"):
+            ((_, created), return_code, return_msg) = Pool.Methods.CreateFilesystems(
+                pool_proxy, {"specs": [(name, (True, size))]}
+            )
 
-    if return_code != 0:
-        sys.exit(return_msg)
+        if return_code != 0:
+            sys.exit(return_msg)
+
+        filesystems.extend(created)
 
-    (real, pool_used_post) = Pool.Properties.TotalPhysicalUsed.Get(pool_proxy)
+    with _timed(latencies, "properties_s"):
+        (real, pool_used_post) = Pool.Properties.TotalPhysicalUsed.Get(pool_proxy)
     if not real:
         pool_used_post = None
 
-    filesystem_object_path = filesystems[0][0]
-    filesystem_proxy = bus.get_object(
-        _SERVICE, filesystem_object_path, introspect=False
+    object_paths = {name: object_path for (object_path, name) in filesystems}
+
+    results = []
+    for name, size in zip(names, sizes):
+        filesystem_proxy = bus.get_object(
+            _SERVICE, object_paths[name], introspect=False
+        )
+
+        with _timed(latencies, "properties_s"):
+            (real, used) = Filesystem.Properties.Used.Get(filesystem_proxy)
+        results.append((size, used if real else None, pool_used_pre, pool_used_post))
+
+    with _timed(latencies, "destroy_s"):
+        (_, return_code, return_msg) = Pool.Methods.DestroyFilesystems(
+            pool_proxy, {"filesystems": list(object_paths.values())}
+        )
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+    return (results, latencies)
+
+
+def _schedule(sizes, trials):
+    """
+    Order the measurements so that each trial measures every size once,
+    going through the sizes in alternate directions in alternate trials, so
+    that any drift over the run affects all sizes alike.
+
+    :param sizes: filesystem sizes
+    :type sizes: list of str
+    :param int trials: number of times to measure each size
+    :returns: trial number and size of each measurement
+    :rtype: generator of int * str
+    """
+    for trial in range(trials):
+        for size in sizes if trial % 2 == 0 else reversed(sizes):
+            yield (trial, size)
+
+
+def _batches(measurements, batch_size, capacity):
+    """
+    Group measurements into batches of at most batch_size, each with total
+    size at most capacity, except that a single size larger than capacity is
+    a batch on its own.
+
+    :param measurements: number, trial number and size of each measurement
+    :param int batch_size: maximum number of sizes in a batch
+    :param int capacity: maximum total size of a batch
+    :returns: batches of measurements
+    :rtype: generator of list of (int * int * str)
+    """
+    (batch, total) = ([], 0)
+    for measurement in measurements:
+        size = measurement[-1]
+        if batch and (len(batch) == batch_size or total + int(size) > capacity):
+            yield batch
+            (batch, total) = ([], 0)
+        batch.append(measurement)
+        total += int(size)
+
+    if batch:
+        yield batch
+
+
+class _Writer:
+    """
+    Writes rows as they are measured, and records the measurements made in a
+    checkpoint file, so that an interrupted run can be resumed. Keeps the
+    samples, and saves them to a NumPy file on exit.
+
+    Each line of the checkpoint file holds the size, the trial number, and
+    the values measured, "nan" for any not obtained, so that the samples of
+    an interrupted run are recovered from it when the run is resumed. Lines
+    with only the size, or the size and trial number, record measurements
+    whose samples were not kept.
+    """
+
+    def __init__(self, output_format, checkpoint=None, samples=None):
+        """
+        Initializer.
+
+        :param str output_format: one of "text", "jsonl" or "csv"
+        :param checkpoint: path of the checkpoint file, or None
+        :type checkpoint: str or NoneType
+        :param samples: path of the samples file, or None
+        :type samples: str or NoneType
+        """
+        self._format = output_format
+        self.measured = set()
+        self.samples = []
+        self._samples_path = samples
+        self._checkpoint = None
+        if checkpoint is not None:
+            if os.path.exists(checkpoint):
+                with open(checkpoint, encoding="utf-8") as file:
+                    for line in file:
+                        fields = line.split()
+                        if fields:
+                            self.measured.add(
+                                (int(fields[1]) if len(fields) > 1 else 0, fields[0])
+                            )
+                        if len(fields) == len(_SAMPLE_FIELDS):
+                            self.samples.append(
+                                (
+                                    int(fields[0]),
+                                    int(fields[1]),
+                                    *(float(value) for value in fields[2:]),
+                                )
+                            )
+            self._checkpoint = open(checkpoint, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._waiting = {}
+        self._next = 0
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(sys.stdout, fieldnames=_FIELDS)
+            self._csv.writeheader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self._write_remaining()
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+        if self._samples_path is not None:
+            import numpy  # noqa: PLC0415
+
+            arrays = self.sample_arrays()
+            numpy.savez_compressed(
+                self._samples_path,
+                size=arrays["size"],
+                trial=arrays["trial"],
+                fs_used=arrays["fs_used"],
+                pool_used_pre=arrays["pool_used_pre"],
+                pool_used_post=arrays["pool_used_post"],
+            )
+
+    def pending(self, measurements):
+        """
+        Filter out the measurements that have already been made, and number
+        the rest in the order in which their rows are to be written.
+
+        :param measurements: trial number and size of each measurement
+        :returns: the number, trial number and size of each measurement not
+            yet made
+        :rtype: generator of int * int * str
+        """
+        return (
+            (index, trial, size)
+            for (index, (trial, size)) in enumerate(
+                measurement
+                for measurement in measurements
+                if measurement not in self.measured
+            )
+        )
+
+    def sample_arrays(self):
+        """
+        Get the samples as arrays, with NaN for values that were not
+        obtained.
+
+        :returns: an array for each of the fields in _SAMPLE_FIELDS
+        :rtype: dict of str * numpy.ndarray
+        """
+        import numpy  # noqa: PLC0415
+
+        columns = list(zip(*self.samples)) or [()] * len(_SAMPLE_FIELDS)
+        return {
+            name: numpy.array(
+                column, dtype=numpy.int64 if name in ("size", "trial") else float
+            )
+            for (name, column) in zip(_SAMPLE_FIELDS, columns)
+        }
+
+    def write(self, batch, rows, latencies):
+        """
+        Write the rows for a batch, along with any rows from other batches
+        that were waiting for them, so that rows are written in the order in
+        which the measurements were numbered. Record the rows written, with
+        their values, in the checkpoint. Rows still waiting on exit, because
+        a measurement before them failed, are written then.
+
+        May be called from several threads.
+
+        :param batch: number, trial number and size of each measurement
+        :type batch: list of (int * int * str)
+        :param rows: a 4-tuple of values for each measurement
+        :param latencies: latencies of the batch's D-Bus calls in seconds
+        :type latencies: dict of str * float
+        """
+        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with self._lock:
+            for (index, trial, _), row in zip(batch, rows):
+                self._waiting[index] = (trial, row, timestamp, latencies)
+
+            indices = []
+            while self._next in self._waiting:
+                indices.append(self._next)
+                self._next += 1
+            self._write_waiting(indices)
+
+    def _write_remaining(self):
+        """
+        Write the rows still waiting, which wait for rows of measurements
+        that failed or were not finished, in order, and record them in the
+        checkpoint. Report the numbers of the rows that are missing.
+        """
+        with self._lock:
+            if not self._waiting:
+                return
+
+            indices = sorted(self._waiting)
+            missing = [
+                index
+                for index in range(self._next, indices[-1])
+                if index not in self._waiting
+            ]
+            self._next = indices[-1] + 1
+            self._write_waiting(indices)
+
+        print(
+            f"Missing rows: {', '.join(str(index) for index in missing)}; their "
+            "measurements failed or were not finished, and the rows after "
+            "them were written.",
+            file=sys.stderr,
+        )
+
+    def _write_waiting(self, indices):
+        """
+        Write the waiting rows with the given numbers, in the given order, and
+        record them, with their values, in the checkpoint.
+
+        Must be called with the lock held.
+
+        :param indices: the numbers of the rows
+        :type indices: list of int
+        """
+        written = []
+        for index in indices:
+            (trial, row, timestamp, latencies) = self._waiting.pop(index)
+            self._write_row(trial, row, timestamp, latencies)
+            written.append((trial, row))
+        sys.stdout.flush()
+
+        if self._checkpoint is not None and written:
+            self._checkpoint.writelines(
+                " ".join(
+                    [
+                        size,
+                        str(trial),
+                        *("nan" if value is None else value for value in values),
+                    ]
+                )
+                + "\n"
+                for (trial, (size, *values)) in written
+            )
+            self._checkpoint.flush()
+            os.fsync(self._checkpoint.fileno())
+
+    def _write_row(self, trial, row, timestamp, latencies):
+        """
+        Write a single row, and keep it as a sample.
+
+        :param int trial: the trial number
+        :param row: a 4-tuple of values
+        :param str timestamp: the time at which the row was measured
+        :param latencies: latencies of the batch's D-Bus calls in seconds
+        :type latencies: dict of str * float
+        """
+        (size, fs_used, pool_used_pre, pool_used_post) = row
+
+        self.samples.append(
+            (
+                int(size),
+                trial,
+                *(
+                    float("nan") if value is None else float(value)
+                    for value in (fs_used, pool_used_pre, pool_used_post)
+                ),
+            )
+        )
+
+        if self._format == "text":
+            print(
+                f"{size} {'ERROR' if fs_used is None else fs_used} "
+                f"{'ERROR' if pool_used_pre is None else pool_used_pre} "
+                f"{'ERROR' if pool_used_post is None else pool_used_post}"
+            )
+            return
+
+        record = dict(
+            zip(
+                _FIELDS,
+                [
+                    None if value is None else int(value)
+                    for value in (size, trial, fs_used, pool_used_pre, pool_used_post)
+                ],
+            ),
+            timestamp=timestamp,
+            **latencies,
+        )
+        if self._csv is None:
+            print(json.dumps(record))
+        else:
+            self._csv.writerow(record)
+
+
+class _SharedIterator:
+    """
+    An iterator that several workers can take items from, and that can be
+    closed so that every worker stops taking them.
+    """
+
+    def __init__(self, iterable):
+        """
+        Initializer.
+
+        :param iterable: the items
+        """
+        self._iterator = iter(iterable)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            if self._closed:
+                raise StopIteration
+            return next(self._iterator)
+
+    def close(self):
+        """
+        Stop giving out items.
+        """
+        with self._lock:
+            self._closed = True
+
+
+def _print_summary(samples):
+    """
+    Print the mean, standard deviation, minimum and maximum of the
+    filesystem's usage and of the increase in the pool's usage, for each
+    size, to stderr.
+
+    :param samples: an array for each of the fields in _SAMPLE_FIELDS
+    :type samples: dict of str * numpy.ndarray
+    """
+    import numpy  # noqa: PLC0415
+
+    print(
+        "size trials used_mean used_std used_min used_max "
+        "delta_mean delta_std delta_min delta_max",
+        file=sys.stderr,
     )
+    delta = samples["pool_used_post"] - samples["pool_used_pre"]
+    for size in numpy.unique(samples["size"]):
+        selected = samples["size"] == size
+        columns = []
+        for values in (samples["fs_used"][selected], delta[selected]):
+            values = values[~numpy.isnan(values)]  # noqa: PLW2901
+            columns.extend(
+                [values.mean(), values.std(), values.min(), values.max()]
+                if values.size > 0
+                else [numpy.nan] * 4
+            )
+        print(
+            f"{size} {numpy.count_nonzero(selected)} "
+            f"{' '.join(f'{value:.1f}' for value in columns)}",
+            file=sys.stderr,
+        )
 
-    (real, used) = Filesystem.Properties.Used.Get(filesystem_proxy)
-    if not real:
-        used = None
 
+def _pool_objects(objects, value, pool_name):
+    """
+    Find a pool, and its filesystems, in the result of GetManagedObjects.
+
+    :param objects: the result of GetManagedObjects
+    :param value: function to get the value of a property from the result
+    :param str pool_name: the name of the pool
+    :returns: the object path of the pool, or None if there is no such pool,
+        and the object paths of its filesystems
+    :rtype: (str or NoneType) * (list of str)
+    """
+    pool_object_path = next(
+        (
+            object_path
+            for (object_path, interfaces) in objects.items()
+            if _POOL_IFACE in interfaces
+            and value(interfaces[_POOL_IFACE]["Name"]) == pool_name
+        ),
+        None,
+    )
+    filesystems = [
+        object_path
+        for (object_path, interfaces) in objects.items()
+        if pool_object_path is not None
+        and _FILESYSTEM_IFACE in interfaces
+        and value(interfaces[_FILESYSTEM_IFACE]["Pool"]) == pool_object_path
+    ]
+    return (pool_object_path, filesystems)
+
+
+def _destroy_filesystems(bus, pool_object_path, filesystems):
+    """
+    Destroy filesystems, if there are any.
+
+    :param bus: system bus
+    :param str pool_object_path: object path of the pool
+    :param filesystems: object paths of the filesystems
+    :type filesystems: list of str
+    """
+    if not filesystems:
+        return
+
+    pool_proxy = bus.get_object(_SERVICE, pool_object_path, introspect=False)
     (_, return_code, return_msg) = Pool.Methods.DestroyFilesystems(
-        pool_proxy, {"filesystems": [filesystem_object_path]}
+        pool_proxy, {"filesystems": filesystems}
     )
 
     if return_code != 0:
         sys.exit(return_msg)
 
-    return (size, used if real else None, pool_used_pre, pool_used_post)
 
-
-def _print_values(devices):
+def _get_pool(bus, proxy, group):
     """
-    Print table of filesystem size values.
+    Create a pool or, if an interrupted run left it behind, reattach to it
+    and destroy any filesystems that were left in it.
 
-    :param devices: list of devices
+    :param bus: system bus
+    :param proxy: proxy to invoke methods on the manager
+    :param group: the name of the pool and the devices to create it from
+    :type group: str * (list of str)
+    :returns: object path of the pool
+    :rtype: str
     """
-    bus = dbus.SystemBus()
+    (pool_name, devices) = group
 
-    proxy = bus.get_object(_SERVICE, _TOP_OBJECT, introspect=False)
+    (pool_object_path, filesystems) = _pool_objects(
+        ObjectManager.Methods.GetManagedObjects(proxy, {}),
+        lambda value: value,
+        pool_name,
+    )
+
+    if pool_object_path is not None:
+        print(f"Reattaching to pool {pool_name}", file=sys.stderr)
+        _destroy_filesystems(bus, pool_object_path, filesystems)
+        return pool_object_path
 
     ((_, (pool_object_path, _)), return_code, return_msg) = Manager.Methods.CreatePool(
         proxy,
         {
-            "name": "pool_name",
+            "name": pool_name,
             "redundancy": (True, 0),
             "devices": devices,
             "key_desc": (False, ""),
@@ -187,17 +831,24 @@ def _print_values(devices):
     if return_code != 0:
         sys.exit(return_msg)
 
-    pool_proxy = bus.get_object(_SERVICE, pool_object_path, introspect=False)
+    return pool_object_path
 
-    for line in sys.stdin:
-        size = line.rstrip()
 
-        (size, fs_used, pool_used_pre, pool_used_post) = _do_one(size, bus, pool_proxy)
-        print(
-            f"{size} {'ERROR' if fs_used is None else fs_used} "
-            f"{'ERROR' if pool_used_pre is None else pool_used_pre} "
-            f"{'ERROR' if pool_used_post is None else pool_used_post}"
-        )
+def _destroy_pool(bus, proxy, pool_name, pool_object_path):
+    """
+    Destroy a pool, along with any filesystems still in it.
+
+    :param bus: system bus
+    :param proxy: proxy to invoke methods on the manager
+    :param str pool_name: the name of the pool
+    :param str pool_object_path: object path of the pool
+    """
+    (_, filesystems) = _pool_objects(
+        ObjectManager.Methods.GetManagedObjects(proxy, {}),
+        lambda value: value,
+        pool_name,
+    )
+    _destroy_filesystems(bus, pool_object_path, filesystems)
 
     (_, return_code, return_msg) = Manager.Methods.DestroyPool(
         proxy, {"pool": pool_object_path}
@@ -207,6 +858,427 @@ def _print_values(devices):
         sys.exit(return_msg)
 
 
+def _print_values(group, measurements, batch_size, writer, bus_address=None):
+    """
+    Print table of filesystem size values, measuring them on one pool.
+
+    :param group: the name of the pool and the devices to create it from
+    :type group: str * (list of str)
+    :param measurements: number, trial number and size of each measurement
+    :param int batch_size: maximum number of filesystems to measure at once
+    :param _Writer writer: writes the rows
+    :param bus_address: address of the bus, or None for the system bus
+    :type bus_address: str or NoneType
+    """
+    bus = dbus.bus.BusConnection(
+        dbus.bus.BUS_SYSTEM if bus_address is None else bus_address
+    )
+
+    proxy = bus.get_object(_SERVICE, _TOP_OBJECT, introspect=False)
+
+    pool_object_path = _get_pool(bus, proxy, group)
+    try:
+        pool_proxy = bus.get_object(_SERVICE, pool_object_path, introspect=False)
+
+        capacity = int(Pool.Properties.TotalPhysicalSize.Get(pool_proxy))
+
+        for batch in _batches(measurements, batch_size, capacity):
+            writer.write(
+                batch, *_do_batch([size for (*_, size) in batch], bus, pool_proxy)
+            )
+    finally:
+        _destroy_pool(bus, proxy, group[0], pool_object_path)
+        bus.close()
+
+
+def _print_values_concurrently(
+    groups, measurements, batch_size, writer, bus_address=None
+):
+    """
+    Print table of filesystem size values, measuring them on several pools
+    concurrently, each in its own thread.
+
+    :param groups: the name of each pool and the devices to create it from
+    :type groups: list of (str * (list of str))
+    :param measurements: number, trial number and size of each measurement
+    :param int batch_size: maximum number of filesystems to measure at once
+    :param _Writer writer: writes the rows
+    :param bus_address: address of the bus, or None for the system bus
+    :type bus_address: str or NoneType
+    """
+    measurements = _SharedIterator(measurements)
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        futures = [
+            executor.submit(
+                _print_values, group, measurements, batch_size, writer, bus_address
+            )
+            for group in groups
+        ]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            # On failure, let the other workers finish their current batch
+            # and destroy their pools.
+            measurements.close()
+
+
+async def _create_filesystems(pool, names, sizes):
+    """
+    Create filesystems concurrently, one for each CreateFilesystems call, as
+    stratisd creates at most one filesystem per call.
+
+    :param pool: the pool's proxy interface
+    :param names: the filesystem names
+    :type names: list of str
+    :param sizes: filesystem sizes to specify
+    :type sizes: list of str
+    :returns: the object path and name of each filesystem created
+    :rtype: list of (str * str)
+    """
+    import asyncio  # noqa: PLC0415
+
+    results = await asyncio.gather(
+        *(
+            pool.call_create_filesystems([[name, [True, size]]])
+            for (name, size) in zip(names, sizes)
+        )
+    )
+
+    filesystems = []
+    for (_, created), return_code, return_msg in results:
+        if return_code != 0:
+            sys.exit(return_msg)
+        filesystems.extend(created)
+
+    return filesystems
+
+
+async def _do_batch_async(sizes, factory, pool_object_path):
+    """
+    Get data for specified sizes, like _do_batch, but reading the pool's
+    usage and the usage of every filesystem concurrently.
+
+    :param sizes: filesystem sizes to specify
+    :type sizes: list of str
+    :param ProxyFactory factory: factory for proxy interfaces
+    :param str pool_object_path: object path of the pool
+    :returns: a 4-tuple of values for each size, and the latencies of the
+        D-Bus calls in seconds
+    :rtype: (list of (str, srt or NoneType, str or NoneType, str or NoneType))
+        * (dict of str * float)
+    """
+    import asyncio  # noqa: PLC0415
+
+    latencies = {}
+
+    pool = factory.interface(pool_object_path, _POOL_IFACE)
+
+    with _timed(latencies, "properties_s"):
+        (real, pool_used_pre) = await pool.get_total_physical_used()
+    if not real:
+        pool_used_pre = None
+
+    names = [f"fs_name_{index}" for index in range(len(sizes))]
+    with _timed(latencies, "create_s"):
+        filesystems = await _create_filesystems(pool, names, sizes)
+
+    object_paths = {name: object_path for (object_path, name) in filesystems}
+
+    with _timed(latencies, "properties_s"):
+        ((real, pool_used_post), *used) = await asyncio.gather(
+            pool.get_total_physical_used(),
+            *(
+                factory.interface(object_paths[name], _FILESYSTEM_IFACE).get_used()
+                for name in names
+            ),
+        )
+    if not real:
+        pool_used_post = None
+
+    with _timed(latencies, "destroy_s"):
+        (_, return_code, return_msg) = await pool.call_destroy_filesystems(
+            list(object_paths.values())
+        )
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+    return (
+        [
+            (size, fs_used if real else None, pool_used_pre, pool_used_post)
+            for (size, (real, fs_used)) in zip(sizes, used)
+        ],
+        latencies,
+    )
+
+
+async def _do_batch_managed(sizes, factory, pool_object_path, pool_used):
+    """
+    Get data for specified sizes, like _do_batch, but reading the pool's
+    usage before creating the filesystems from the pool's latest
+    PropertiesChanged signal, and all usage after creating them with a single
+    GetManagedObjects call.
+
+    After destroying the filesystems, reads the pool's usage, so that the
+    next batch does not start from the usage signalled before the destroy,
+    unless a change to it is signalled within _USAGE_CHANGE_TIMEOUT.
+
+    :param sizes: filesystem sizes to specify
+    :type sizes: list of str
+    :param ProxyFactory factory: factory for proxy interfaces
+    :param str pool_object_path: object path of the pool
+    :param pool_used: holds the pool's latest usage under "value", and an
+        asyncio.Event set on each change under "changed"
+    :type pool_used: dict of str * object
+    :returns: a 4-tuple of values for each size, and the latencies of the
+        D-Bus calls in seconds
+    :rtype: (list of (str, srt or NoneType, str or NoneType, str or NoneType))
+        * (dict of str * float)
+    """
+    import asyncio  # noqa: PLC0415
+
+    latencies = {}
+
+    pool = factory.interface(pool_object_path, _POOL_IFACE)
+
+    pool_used_pre = pool_used["value"]
+
+    names = [f"fs_name_{index}" for index in range(len(sizes))]
+    with _timed(latencies, "create_s"):
+        filesystems = await _create_filesystems(pool, names, sizes)
+
+    object_paths = {name: object_path for (object_path, name) in filesystems}
+
+    with _timed(latencies, "properties_s"):
+        objects = await factory.interface(
+            _TOP_OBJECT, _OBJECT_MANAGER_IFACE
+        ).call_get_managed_objects()
+
+    (real, pool_used_post) = objects[pool_object_path][_POOL_IFACE][
+        "TotalPhysicalUsed"
+    ].value
+    if not real:
+        pool_used_post = None
+
+    results = []
+    for name, size in zip(names, sizes):
+        (real, used) = objects[object_paths[name]][_FILESYSTEM_IFACE]["Used"].value
+        results.append((size, used if real else None, pool_used_pre, pool_used_post))
+
+    pool_used["changed"].clear()
+    with _timed(latencies, "destroy_s"):
+        (_, return_code, return_msg) = await pool.call_destroy_filesystems(
+            list(object_paths.values())
+        )
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+    try:
+        await asyncio.wait_for(pool_used["changed"].wait(), _USAGE_CHANGE_TIMEOUT)
+    except TimeoutError:
+        with _timed(latencies, "properties_s"):
+            (real, value) = await pool.get_total_physical_used()
+        pool_used["value"] = value if real else None
+
+    return (results, latencies)
+
+
+async def _track_pool_used(factory, pool_object_path):
+    """
+    Track the pool's usage from its PropertiesChanged signals.
+
+    :param ProxyFactory factory: factory for proxy interfaces
+    :param str pool_object_path: object path of the pool
+    :returns: a dict that holds the pool's latest usage under "value", and
+        an asyncio.Event set on each change under "changed"
+    :rtype: dict of str * object
+    """
+    import asyncio  # noqa: PLC0415
+
+    (real, value) = await factory.interface(
+        pool_object_path, _POOL_IFACE
+    ).get_total_physical_used()
+    pool_used = {"value": value if real else None, "changed": asyncio.Event()}
+
+    def on_properties_changed(interface_name, changed_properties, _invalidated):
+        if interface_name == _POOL_IFACE and "TotalPhysicalUsed" in changed_properties:
+            (real, value) = changed_properties["TotalPhysicalUsed"].value
+            pool_used["value"] = value if real else None
+            pool_used["changed"].set()
+
+    factory.interface(pool_object_path, _PROPERTIES_IFACE).on_properties_changed(
+        on_properties_changed
+    )
+
+    return pool_used
+
+
+async def _get_pool_async(factory, group):
+    """
+    Create a pool or reattach to it, like _get_pool.
+
+    :param ProxyFactory factory: factory for proxy interfaces
+    :param group: the name of the pool and the devices to create it from
+    :type group: str * (list of str)
+    :returns: object path of the pool
+    :rtype: str
+    """
+    (pool_name, devices) = group
+
+    (pool_object_path, filesystems) = _pool_objects(
+        await factory.interface(
+            _TOP_OBJECT, _OBJECT_MANAGER_IFACE
+        ).call_get_managed_objects(),
+        lambda variant: variant.value,
+        pool_name,
+    )
+
+    if pool_object_path is not None:
+        print(f"Reattaching to pool {pool_name}", file=sys.stderr)
+        if filesystems:
+            (_, return_code, return_msg) = await factory.interface(
+                pool_object_path, _POOL_IFACE
+            ).call_destroy_filesystems(filesystems)
+            if return_code != 0:
+                sys.exit(return_msg)
+        return pool_object_path
+
+    ((_, (pool_object_path, _)), return_code, return_msg) = await factory.interface(
+        _TOP_OBJECT, _MANAGER_IFACE
+    ).call_create_pool(pool_name, [True, 0], devices, [False, ""], [False, ["", ""]])
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+    return pool_object_path
+
+
+async def _destroy_pool_async(factory, pool_name, pool_object_path):
+    """
+    Destroy a pool, along with any filesystems still in it.
+
+    :param ProxyFactory factory: factory for proxy interfaces
+    :param str pool_name: the name of the pool
+    :param str pool_object_path: object path of the pool
+    """
+    (_, filesystems) = _pool_objects(
+        await factory.interface(
+            _TOP_OBJECT, _OBJECT_MANAGER_IFACE
+        ).call_get_managed_objects(),
+        lambda variant: variant.value,
+        pool_name,
+    )
+
+    if filesystems:
+        (_, return_code, return_msg) = await factory.interface(
+            pool_object_path, _POOL_IFACE
+        ).call_destroy_filesystems(filesystems)
+        if return_code != 0:
+            sys.exit(return_msg)
+
+    (_, return_code, return_msg) = await factory.interface(
+        _TOP_OBJECT, _MANAGER_IFACE
+    ).call_destroy_pool(pool_object_path)
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+
+async def _print_values_async(  # noqa: PLR0913
+    group, measurements, batch_size, writer, factory, *, managed_objects=False
+):
+    """
+    Print table of filesystem size values, measuring them on one pool, using
+    the asyncio client.
+
+    :param group: the name of the pool and the devices to create it from
+    :type group: str * (list of str)
+    :param measurements: number, trial number and size of each measurement
+    :param int batch_size: maximum number of filesystems to measure at once
+    :param _Writer writer: writes the rows
+    :param ProxyFactory factory: factory for proxy interfaces
+    :param bool managed_objects: use GetManagedObjects and signals
+    """
+    pool_object_path = await _get_pool_async(factory, group)
+    try:
+        pool = factory.interface(pool_object_path, _POOL_IFACE)
+        capacity = int(await pool.get_total_physical_size())
+
+        pool_used = (
+            await _track_pool_used(factory, pool_object_path)
+            if managed_objects
+            else None
+        )
+
+        for batch in _batches(measurements, batch_size, capacity):
+            sizes = [size for (*_, size) in batch]
+            writer.write(
+                batch,
+                *await (
+                    _do_batch_async(sizes, factory, pool_object_path)
+                    if pool_used is None
+                    else _do_batch_managed(sizes, factory, pool_object_path, pool_used)
+                ),
+            )
+    finally:
+        await _destroy_pool_async(factory, group[0], pool_object_path)
+
+
+async def _print_values_concurrently_async(  # noqa: PLR0913
+    groups, measurements, batch_size, writer, bus_address=None, *, managed_objects=False
+):
+    """
+    Print table of filesystem size values, measuring them on several pools
+    concurrently, in one task each, over one connection.
+
+    :param groups: the name of each pool and the devices to create it from
+    :type groups: list of (str * (list of str))
+    :param measurements: number, trial number and size of each measurement
+    :param int batch_size: maximum number of filesystems to measure at once
+    :param _Writer writer: writes the rows
+    :param bus_address: address of the bus, or None for the system bus
+    :type bus_address: str or NoneType
+    :param bool managed_objects: use GetManagedObjects and signals
+    """
+    import asyncio  # noqa: PLC0415
+
+    from _async_client import ProxyFactory, connect  # noqa: PLC0415
+
+    bus = await connect(bus_address)
+    factory = ProxyFactory(bus, _SERVICE, SPECS)
+
+    measurements = _SharedIterator(measurements)
+    try:
+        await asyncio.gather(
+            *(
+                _print_values_async(
+                    group,
+                    measurements,
+                    batch_size,
+                    writer,
+                    factory,
+                    managed_objects=managed_objects,
+                )
+                for group in groups
+            )
+        )
+    finally:
+        # On failure, let the other tasks finish their current batch and
+        # destroy their pools, which needs the bus to stay connected.
+        measurements.close()
+
+    bus.disconnect()
+
+
+def _exit_on_signal(signum, _frame):
+    """
+    Exit on a signal, so that the pool is cleaned up as on an exception.
+    """
+    sys.exit(128 + signum)
+
+
 def main():
     """
     Main method
@@ -215,7 +1287,57 @@ def main():
     parser = gen_parser()
     args = parser.parse_args()
 
-    _print_values(args.device)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    device_groups = ([args.device] if args.device else []) + args.device_groups
+    if args.test_config is not None:
+        with open(args.test_config, encoding="utf-8") as file:
+            devices = json.load(file)["ok_to_destroy_dev_array_key"]
+        device_groups.extend(
+            devices[index : index + args.group_size]
+            for index in range(0, len(devices), args.group_size)
+        )
+    if not device_groups:
+        parser.error("no devices specified")
+
+    groups = [
+        (_POOL_NAME if index == 0 else f"{_POOL_NAME}_{index}", devices)
+        for (index, devices) in enumerate(device_groups)
+    ]
+
+    if args.sweeps:
+        try:
+            sizes = [
+                str(size)
+                for size in _sweep.unique(_sweep.parse(spec) for spec in args.sweeps)
+            ]
+        except ValueError as err:
+            parser.error(str(err))
+    else:
+        sizes = [line.strip() for line in sys.stdin if line.strip()]
+
+    with _Writer(args.format, args.checkpoint, args.samples) as writer:
+        measurements = writer.pending(_schedule(sizes, args.trials))
+        if args.asyncio or args.managed_objects:
+            import asyncio  # noqa: PLC0415
+
+            asyncio.run(
+                _print_values_concurrently_async(
+                    groups,
+                    measurements,
+                    args.batch_size,
+                    writer,
+                    args.bus_address,
+                    managed_objects=args.managed_objects,
+                )
+            )
+        else:
+            _print_values_concurrently(
+                groups, measurements, args.batch_size, writer, args.bus_address
+            )
+
+        if args.trials > 1:
+            _print_summary(writer.sample_arrays())
 
 
 if __name__ == "__main__":
@@ -4,6 +4,10 @@ Generate a list of integers for input to another program.
 """
 
 import argparse
+import csv
+import json
+
+import _sweep
 
 
 def gen_parser():
@@ -24,20 +28,95 @@ def gen_parser():
         "--stop", action="store", type=int, default=8 * 1024**4, help="End value"
     )
 
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        dest="sweeps",
+        help=(
+            "Sweep of values, as KIND:ARGS, instead of powers of two from "
+            "--start to --stop. May be given more than once. KIND is one of "
+            f"{', '.join(_sweep.KINDS)}; ARGS are START,STOP,INTERVALS for "
+            "linear and log-uniform, START,STOP[,RATIO] for geometric, and "
+            "BREAKPOINT,WIDTH,COUNT for refine."
+        ),
+    )
+
+    parser.add_argument(
+        "--measured",
+        action="store",
+        default=None,
+        help=(
+            "File of values already measured, which are left out: earlier "
+            "output of filesystem_size_estimate.py in any --format, i.e., "
+            "lines which start with a value, JSON lines with a 'size' "
+            "field, or CSV with a 'size' column, or its --checkpoint file."
+        ),
+    )
+
     return parser
 
 
-def _print_values(*, start, stop):
+def _size(value, path, number):
     """
-    Print a succession of integer values. Each size is double that of the last.
+    Parse a value already measured.
 
-    :param int start: the value to start at
-    :param int stop: the value to end at
+    :param value: the value, as read
+    :param str path: the file it was read from
+    :param int number: the number of the line it was read from
+    :rtype: int
+    :raises ValueError: if the value is not a non-negative integer
     """
-    value = start
-    while value <= stop:
-        print(value)
-        value = value * 2
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return int(value)
+    raise ValueError(f"{path}, line {number}: {value!r} is not a size")
+
+
+def _measured(path):
+    """
+    Read the values already measured from a file, as text, JSON lines, or
+    CSV, according to its first line.
+
+    :param str path: the file
+    :rtype: list of int
+    :raises OSError: if the file can not be read
+    :raises ValueError: if a line has no value
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        lines = [
+            (number, line) for (number, line) in enumerate(file, 1) if line.strip()
+        ]
+
+    if not lines:
+        return []
+
+    first = lines[0][1]
+    if first.lstrip().startswith("{"):
+        values = []
+        for number, line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as err:
+                raise ValueError(f"{path}, line {number}: {err}") from err
+            values.append(
+                _size(
+                    record.get("size") if isinstance(record, dict) else None,
+                    path,
+                    number,
+                )
+            )
+        return values
+
+    if next(csv.reader([first]))[0] == "size":
+        return [
+            _size(row["size"], path, number)
+            for (number, row) in zip(
+                (number for (number, _) in lines[1:]),
+                csv.DictReader(line for (_, line) in lines),
+            )
+        ]
+
+    return [_size(line.split()[0], path, number) for (number, line) in lines]
 
 
 def main():
@@ -48,7 +127,18 @@ def main():
     parser = gen_parser()
     args = parser.parse_args()
 
-    _print_values(start=args.start, stop=args.stop)
+    try:
+        sweeps = (
+            [_sweep.parse(spec) for spec in args.sweeps]
+            if args.sweeps
+            else [_sweep.geometric(args.start, args.stop)]
+        )
+        measured = [] if args.measured is None else _measured(args.measured)
+    except (OSError, ValueError) as err:
+        parser.error(str(err))
+
+    for value in _sweep.unique(sweeps, measured):
+        print(value)
 
 
 if __name__ == "__main__":
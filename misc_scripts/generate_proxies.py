@@ -0,0 +1,247 @@
+#!/usr/bin/python3
+"""
+Generate static dbus-python proxy classes from introspection data.
+"""
+
+import argparse
+import ast
+import sys
+import xml.etree.ElementTree as ET
+
+from _proxies import GENERATED_MODULE, class_name
+
+_TIMEOUT_DEFAULT = 120000
+
+
+def gen_parser():
+    """
+    Generate parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Generate a Python module of skeletons of the dbus-python proxy "
+            "classes made by dbus_python_client_gen.make_class, which need no "
+            "introspection data parsed, or classes built, when they are "
+            "imported; each method calls that of the class make_class builds, "
+            "building it when a method is first called. Each file must "
+            "assign a dict of interface name to interface XML to SPECS, as in "
+            "the output of 'update_introspection_data.py python' or in the "
+            "scripts in this directory. The scripts use the module, named "
+            f"{GENERATED_MODULE}.py, for any interface with the same "
+            "XML as in their own SPECS, and otherwise build their classes "
+            "the first time they are used."
+        )
+    )
+    parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="File to read the specifications from, '-' for stdin.",
+    )
+    parser.add_argument(
+        "--output",
+        action="store",
+        default=None,
+        help="File to write the module to, instead of stdout.",
+    )
+    parser.add_argument(
+        "--timeout",
+        action="store",
+        default=_TIMEOUT_DEFAULT,
+        type=int,
+        help=f"D-Bus timeout in ms for all calls (default is {_TIMEOUT_DEFAULT}).",
+    )
+    return parser
+
+
+def _read_specs(path):
+    """
+    Read the specifications assigned to SPECS in a Python file, without
+    running it.
+
+    :param str path: the file, or '-' for stdin
+    :returns: the interface specifications
+    :rtype: dict of str * str
+    :raises RuntimeError: if there is no suitable assignment to SPECS
+    """
+    if path == "-":
+        source = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+
+    for node in ast.parse(source, filename=path).body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == "SPECS"
+        ):
+            specs = ast.literal_eval(node.value)
+            if not isinstance(specs, dict) or not all(
+                isinstance(key, str) and isinstance(value, str)
+                for (key, value) in specs.items()
+            ):
+                raise RuntimeError(f"SPECS in {path} is not a dict of str to str")
+            return specs
+
+    raise RuntimeError(f"{path} does not assign to SPECS")
+
+
+def _merge_specs(paths):
+    """
+    Read the specifications from several files. An interface may be
+    specified in more than one file, but only if it is specified the same
+    way in each.
+
+    :param paths: the files
+    :type paths: list of str
+    :returns: the interface specifications
+    :rtype: dict of str * str
+    :raises RuntimeError: if an interface is specified in different ways
+    """
+    specs = {}
+    for path in paths:
+        for interface_name, spec in _read_specs(path).items():
+            if specs.setdefault(interface_name, spec) != spec:
+                raise RuntimeError(
+                    f"{interface_name} in {path} differs from an earlier specification"
+                )
+    return specs
+
+
+def _call(function, interface_name, *args):
+    """
+    The source of a call to one of the functions of _proxies.
+
+    :param str function: the function name
+    :param str interface_name: the interface name
+    :param args: the other arguments, which are output with repr
+    :rtype: str
+    """
+    return (
+        f"{function}({', '.join(repr(arg) for arg in (interface_name, *args))}, "
+        f"SPECS[{interface_name!r}], TIMEOUT)"
+    )
+
+
+def _class_source(interface_name, spec):
+    """
+    The source of the class for an interface.
+
+    :param str interface_name: the interface name
+    :param str spec: the interface specification
+    :rtype: str
+    """
+    interface = ET.fromstring(spec)
+
+    methods = [
+        f"        {element.attrib['name']} = "
+        + _call("method", interface_name, element.attrib["name"])
+        for element in interface.iterfind("method")
+    ]
+
+    properties = []
+    for element in interface.iterfind("property"):
+        (name, access) = (element.attrib["name"], element.attrib["access"])
+        properties.append(f"        class {name}:")
+        if access in ("read", "readwrite"):
+            properties.append(
+                f"            Get = {_call('getter', interface_name, name)}"
+            )
+        if access in ("write", "readwrite"):
+            properties.append(
+                f"            Set = {_call('setter', interface_name, name)}"
+            )
+
+    return "\n".join(
+        [
+            f"class {class_name(interface_name)}:",
+            '    """',
+            f"    {interface_name}",
+            '    """',
+            "",
+            "    class Methods:",
+            *(methods or ["        pass"]),
+            "",
+            "    class Properties:",
+            *(properties or ["        pass"]),
+        ]
+    )
+
+
+def _module_source(specs, timeout, paths):
+    """
+    The source of the generated module.
+
+    :param specs: the interface specifications
+    :type specs: dict of str * str
+    :param int timeout: D-Bus timeout in ms
+    :param paths: the files the specifications were read from
+    :type paths: list of str
+    :rtype: str
+    :raises RuntimeError: if two interfaces would have classes of the same name
+    """
+    interface_names = sorted(specs)
+
+    class_names = [class_name(interface_name) for interface_name in interface_names]
+    duplicates = sorted({name for name in class_names if class_names.count(name) > 1})
+    if duplicates:
+        raise RuntimeError(f"more than one interface has class name {duplicates[0]}")
+
+    return "\n".join(
+        [
+            '"""',
+            "dbus-python proxy classes, generated by generate_proxies.py from",
+            f"{', '.join(paths)}. Do not edit.",
+            '"""',
+            "",
+            "from _proxies import getter, method, setter",
+            "",
+            f"TIMEOUT = {timeout}",
+            "",
+            "SPECS = {",
+            *(
+                f'    "{interface_name}": """{specs[interface_name]}""",'
+                for interface_name in interface_names
+            ),
+            "}",
+            "",
+            *(
+                f"\n{_class_source(interface_name, specs[interface_name])}\n"
+                for interface_name in interface_names
+            ),
+            "",
+            "CLASSES = {",
+            *(
+                f'    "{interface_name}": {class_name(interface_name)},'
+                for interface_name in interface_names
+            ),
+            "}",
+            "",
+        ]
+    )
+
+
+def main():
+    """
+    Main method
+    """
+
+    parser = gen_parser()
+    args = parser.parse_args()
+
+    try:
+        source = _module_source(_merge_specs(args.files), args.timeout, args.files)
+    except (OSError, SyntaxError, ValueError, KeyError, RuntimeError) as err:
+        sys.exit(f"{type(err).__name__}: {err}")
+
+    if args.output is None:
+        print(source, end="")
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(source)
+
+
+if __name__ == "__main__":
+    main()
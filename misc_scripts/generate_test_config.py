@@ -26,12 +26,23 @@ import json
 import sys
 
 
+def test_config(drives):
+    """
+    Make the JSON text of a test config file.
+
+    :param drives: the devices that may be overwritten
+    :type drives: list of str
+    :rtype: str
+    """
+    return json.dumps({"ok_to_destroy_dev_array_key": (drives)}, indent=4)
+
+
 def main():
     """
     Main method
     """
     drives = sys.argv[1:]
-    jsonout = json.dumps({"ok_to_destroy_dev_array_key": (drives)}, indent=4)
+    jsonout = test_config(drives)
     print(jsonout)
 
 
@@ -0,0 +1,343 @@
+#!/usr/bin/python3
+"""
+Provision loop devices backed by sparse files to use as Stratis test devices.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from generate_test_config import test_config
+
+_CONFIG_DEFAULT = "/etc/stratis/test_config.json"
+_STATE_DEFAULT = "/run/stratis-test-loop-devices.json"
+_DIR_DEFAULT = "/dev/shm"
+_COUNT_DEFAULT = 4
+_SIZE_DEFAULT = 8 * 1024**3
+
+
+def gen_parser():
+    """
+    Generate parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Create sparse files, attach them as loop devices, and write a "
+            "Stratis test config listing the devices, so that the blackbox "
+            "and stratisd test-real suites can run without any spare disks. "
+            "On tmpfs, the default, the files take only as much memory as "
+            "is written to them. Everything that is set up is recorded in a "
+            "state file, which teardown reads to detach the devices, remove "
+            "the files, and restore any test config that was there before. "
+            "Must be run with root permissions."
+        )
+    )
+    parser.add_argument(
+        "--state",
+        action="store",
+        default=_STATE_DEFAULT,
+        help=f"The state file (default is {_STATE_DEFAULT}).",
+    )
+
+    subparsers = parser.add_subparsers(title="subcommands", required=True)
+
+    setup_parser = subparsers.add_parser(
+        "setup", help="Set up loop devices and write the test config."
+    )
+    setup_parser.set_defaults(func=_setup_command)
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help=(
+            "Set up loop devices, run a command, and tear them down again, "
+            "whether or not the command succeeds; exits with the exit code "
+            "of the command."
+        ),
+    )
+    run_parser.add_argument("command", nargs="+", help="The command to run.")
+    run_parser.set_defaults(func=_run_command)
+
+    for subparser in (setup_parser, run_parser):
+        subparser.add_argument(
+            "--count",
+            action="store",
+            default=_COUNT_DEFAULT,
+            type=int,
+            help=f"Number of loop devices (default is {_COUNT_DEFAULT}).",
+        )
+        subparser.add_argument(
+            "--size",
+            action="store",
+            default=_SIZE_DEFAULT,
+            type=int,
+            help=(
+                "Size of each device in bytes; the backing files are sparse, "
+                f"so take no space until written to (default is {_SIZE_DEFAULT})."
+            ),
+        )
+        subparser.add_argument(
+            "--dir",
+            action="store",
+            default=_DIR_DEFAULT,
+            help=(
+                "Directory, ideally on tmpfs or a fast local disk, in which "
+                "to make a directory for the backing files "
+                f"(default is {_DIR_DEFAULT})."
+            ),
+        )
+        subparser.add_argument(
+            "--no-direct-io",
+            action="store_false",
+            dest="direct_io",
+            help=(
+                "Do not use direct I/O for the loop devices, which otherwise "
+                "bypass the page cache for the backing files, where the "
+                "filesystem supports it."
+            ),
+        )
+        subparser.add_argument(
+            "--config",
+            action="store",
+            default=_CONFIG_DEFAULT,
+            help=f"The test config file to write (default is {_CONFIG_DEFAULT}).",
+        )
+
+    teardown_parser = subparsers.add_parser(
+        "teardown",
+        help=(
+            "Detach the loop devices, remove the backing files, and restore "
+            "the test config; does nothing if there is no state file."
+        ),
+    )
+    teardown_parser.set_defaults(func=_teardown_command)
+
+    return parser
+
+
+def _write_state(path, state):
+    """
+    Write the state file, atomically.
+
+    :param str path: the state file
+    :param dict state: the state
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=os.path.dirname(path), suffix=".tmp", delete=False
+    ) as file:
+        json.dump(state, file, indent=4)
+    os.replace(file.name, path)
+
+
+def _backing_file(device):
+    """
+    Get the backing file of a loop device.
+
+    :param str device: the loop device
+    :returns: the backing file, or None if the device is not attached
+    :rtype: str or NoneType
+    """
+    result = subprocess.run(
+        ["losetup", "--list", "--noheadings", "--output", "BACK-FILE", device],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def teardown(state_path):
+    """
+    Undo everything recorded in the state file, in reverse order, and
+    remove it. Each step is attempted even if an earlier one fails, and
+    steps already undone are skipped, so teardown can be repeated until it
+    succeeds.
+
+    :param str state_path: the state file
+    :returns: True if everything was undone
+    :rtype: bool
+    """
+    try:
+        with open(state_path, encoding="utf-8") as file:
+            state = json.load(file)
+    except FileNotFoundError:
+        return True
+
+    succeeded = True
+
+    if state["config_written"]:
+        try:
+            if state["config_backup"] is None:
+                os.remove(state["config"])
+            else:
+                with open(state["config"], "w", encoding="utf-8") as file:
+                    file.write(state["config_backup"])
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            print(f"Could not restore {state['config']}: {err}", file=sys.stderr)
+            succeeded = False
+
+    for device, backing_file in reversed(state["devices"]):
+        # The device may have been detached and its number reused since.
+        if _backing_file(device) != backing_file:
+            continue
+        result = subprocess.run(
+            ["losetup", "--detach", device], capture_output=True, check=False, text=True
+        )
+        if result.returncode != 0:
+            print(
+                f"Could not detach {device}: {result.stderr.strip()}; is it "
+                "still in use, e.g., by a Stratis pool? See teardown.sh.",
+                file=sys.stderr,
+            )
+            succeeded = False
+
+    if succeeded:
+        shutil.rmtree(state["dir"], ignore_errors=True)
+        os.remove(state_path)
+
+    return succeeded
+
+
+def setup(state_path, *, count, size, directory, direct_io, config):  # noqa: PLR0913
+    """
+    Create the backing files, attach the loop devices, and write the test
+    config, recording each step in the state file as it is done, so that
+    teardown can undo however much was done. On failure, tears down
+    whatever was set up.
+
+    :param str state_path: the state file
+    :param int count: the number of devices
+    :param int size: the size of each device in bytes
+    :param str directory: where to make a directory for the backing files
+    :param bool direct_io: whether to use direct I/O
+    :param str config: the test config file
+    :returns: the loop devices
+    :rtype: list of str
+    :raises RuntimeError: if the devices are already set up
+    """
+    if os.path.exists(state_path):
+        raise RuntimeError(
+            f"{state_path} exists; tear down the devices it records first"
+        )
+
+    state = {
+        "dir": tempfile.mkdtemp(prefix="stratis-loop-", dir=directory),
+        "devices": [],
+        "config": os.path.abspath(config),
+        "config_backup": None,
+        "config_written": False,
+    }
+    _write_state(state_path, state)
+
+    try:
+        for index in range(count):
+            backing_file = os.path.join(state["dir"], f"disk{index}.img")
+            with open(backing_file, "wb") as file:
+                file.truncate(size)
+
+            device = subprocess.run(
+                [
+                    "losetup",
+                    "--find",
+                    "--show",
+                    f"--direct-io={'on' if direct_io else 'off'}",
+                    backing_file,
+                ],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+            state["devices"].append((device, backing_file))
+            _write_state(state_path, state)
+
+        devices = [device for (device, _) in state["devices"]]
+
+        try:
+            with open(config, encoding="utf-8") as file:
+                state["config_backup"] = file.read()
+        except FileNotFoundError:
+            pass
+        state["config_written"] = True
+        _write_state(state_path, state)
+        os.makedirs(os.path.dirname(state["config"]), exist_ok=True)
+        with open(config, "w", encoding="utf-8") as file:
+            print(test_config(devices), file=file)
+    except BaseException:
+        teardown(state_path)
+        raise
+
+    return devices
+
+
+def _setup_args(args):
+    """
+    The keyword arguments of setup from the command-line arguments.
+
+    :param args: the parsed command-line arguments
+    :rtype: dict
+    """
+    return {
+        "count": args.count,
+        "size": args.size,
+        "directory": args.dir,
+        "direct_io": args.direct_io,
+        "config": args.config,
+    }
+
+
+def _setup_command(args):
+    """
+    Set up the loop devices and print them.
+    """
+    print("\n".join(setup(args.state, **_setup_args(args))))
+    return 0
+
+
+def _run_command(args):
+    """
+    Run a command with the loop devices set up.
+    """
+    devices = setup(args.state, **_setup_args(args))
+    try:
+        print(f"Test devices: {' '.join(devices)}", flush=True)
+        return subprocess.run(args.command, check=False).returncode
+    finally:
+        if not teardown(args.state):
+            print(
+                f"Teardown was incomplete; rerun '{sys.argv[0]} --state "
+                f"{args.state} teardown'",
+                file=sys.stderr,
+            )
+
+
+def _teardown_command(args):
+    """
+    Tear down the loop devices.
+    """
+    return 0 if teardown(args.state) else 1
+
+
+def main():
+    """
+    Main method
+    """
+
+    parser = gen_parser()
+    args = parser.parse_args()
+
+    try:
+        return args.func(args)
+    except (OSError, RuntimeError, subprocess.CalledProcessError) as err:
+        stderr = getattr(err, "stderr", None)
+        sys.exit(str(err) if not stderr else f"{err}\n{stderr.strip()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+"""
+Run a command against stratisd --sim on a private bus.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+from _async_client import ProxyFactory, connect
+
+# a minimal chunk of introspection data, enough for the methods needed.
+SPECS = {
+    "org.freedesktop.DBus": """
+<interface name="org.freedesktop.DBus">
+<method name="NameHasOwner">
+<arg name="name" type="s" direction="in"/>
+<arg name="has_owner" type="b" direction="out"/>
+</method>
+<signal name="NameOwnerChanged">
+<arg name="name" type="s"/>
+<arg name="old_owner" type="s"/>
+<arg name="new_owner" type="s"/>
+</signal>
+</interface>
+"""
+}
+
+_BUS_SERVICE = "org.freedesktop.DBus"
+_BUS_OBJECT = "/org/freedesktop/DBus"
+_BUS_IFACE = "org.freedesktop.DBus"
+
+_SERVICE = "org.storage.stratis3"
+
+# stratisd may run in a user namespace, in which its uid is not the one the
+# bus sees, so EXTERNAL authentication fails for it, and it falls back to
+# ANONYMOUS. Only the owner of the temporary directory can reach the socket.
+_BUS_CONFIG = """<!DOCTYPE busconfig PUBLIC
+ "-//freedesktop//DTD D-Bus Bus Configuration 1.0//EN"
+ "http://www.freedesktop.org/standards/dbus/1.0/busconfig.dtd">
+<busconfig>
+  <type>session</type>
+  <listen>unix:path={socket}</listen>
+  <auth>EXTERNAL</auth>
+  <auth>ANONYMOUS</auth>
+  <allow_anonymous/>
+  <policy context="default">
+    <allow own="*"/>
+    <allow send_destination="*" eavesdrop="true"/>
+    <allow eavesdrop="true"/>
+  </policy>
+</busconfig>
+"""
+
+# stratisd takes a lock on /run/stratisd.pid, even with --sim, so it gets a
+# /run of its own, which neither the system stratisd nor any other private
+# one shares.
+_PRIVATE_RUN = 'mount -t tmpfs tmpfs /run && exec "$0" --sim'
+
+_TIMEOUT_DEFAULT = 30
+_STRATISD_DEFAULT = shutil.which("stratisd") or "/usr/libexec/stratisd"
+
+
+def gen_parser():
+    """
+    Generate parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Start a private dbus-daemon and stratisd --sim on it, run a "
+            "command with DBUS_SYSTEM_BUS_ADDRESS set to the address of the "
+            "bus, then stop both. Any '{}' in the "
+            "command is also replaced by the address, e.g., "
+            "'private_bus.py -- ./filesystem_size_estimate.py --bus-address "
+            "{} ...'. stratisd runs in a mount namespace of its own, with a "
+            "private /run, so that it does not contend for /run/stratisd.pid "
+            "with the system stratisd or with another run, and several runs "
+            "can be made at once. If not run as root, stratisd also runs in "
+            "a user namespace, in which it is root, which needs unprivileged "
+            "user namespaces to be enabled. The temporary directory, in "
+            "which the bus's socket is made, must not be under /run. Exits "
+            "with the exit code of the command."
+        )
+    )
+    parser.add_argument(
+        "--stratisd",
+        action="store",
+        default=_STRATISD_DEFAULT,
+        help=f"The stratisd binary (default is {_STRATISD_DEFAULT}).",
+    )
+    parser.add_argument(
+        "--timeout",
+        action="store",
+        default=_TIMEOUT_DEFAULT,
+        type=float,
+        help=(
+            "Seconds to wait for stratisd to take its name on the bus "
+            f"(default is {_TIMEOUT_DEFAULT})."
+        ),
+    )
+    parser.add_argument("command", nargs="+", help="The command to run.")
+    return parser
+
+
+def _stratisd_command(stratisd):
+    """
+    The command to run stratisd --sim in a mount namespace of its own and,
+    if not root, in a user namespace in which it is root.
+
+    :param str stratisd: the stratisd binary
+    :rtype: list of str
+    """
+    return [
+        "unshare",
+        *([] if os.geteuid() == 0 else ["--user", "--map-root-user"]),
+        "--mount",
+        "--propagation",
+        "private",
+        "--",
+        "sh",
+        "-c",
+        _PRIVATE_RUN,
+        stratisd,
+    ]
+
+
+async def _stop(process):
+    """
+    Stop a process, if it is still running, and wait for it to exit.
+
+    :param process: the process
+    :type process: asyncio.subprocess.Process
+    """
+    if process.returncode is None:
+        process.terminate()
+    await process.wait()
+
+
+async def _wait_for_name(bus, name, process, timeout):
+    """
+    Wait until a name has an owner on the bus. Listens for NameOwnerChanged
+    before checking whether the name already has an owner, so that the
+    signal can not be missed.
+
+    :param MessageBus bus: the bus
+    :param str name: the name
+    :param process: the process that should take the name
+    :type process: asyncio.subprocess.Process
+    :param float timeout: seconds to wait
+    :raises RuntimeError: if the process exits or the timeout expires first
+    """
+    interface = ProxyFactory(bus, _BUS_SERVICE, SPECS).interface(
+        _BUS_OBJECT, _BUS_IFACE
+    )
+
+    owned = asyncio.Event()
+
+    def on_name_owner_changed(changed_name, _old_owner, new_owner):
+        if changed_name == name and new_owner:
+            owned.set()
+
+    interface.on_name_owner_changed(on_name_owner_changed)
+    try:
+        if await interface.call_name_has_owner(name):
+            return
+
+        waiters = [
+            asyncio.ensure_future(owned.wait()),
+            asyncio.ensure_future(process.wait()),
+        ]
+        try:
+            await asyncio.wait(
+                waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+        if not owned.is_set():
+            raise RuntimeError(
+                f"{name} did not appear on the bus"
+                + (
+                    f", process exited with code {process.returncode}"
+                    if process.returncode is not None
+                    else f" within {timeout} seconds"
+                )
+            )
+    finally:
+        interface.off_name_owner_changed(on_name_owner_changed)
+
+
+@contextlib.asynccontextmanager
+async def private_stratisd(stratisd=_STRATISD_DEFAULT, *, timeout=_TIMEOUT_DEFAULT):
+    """
+    Start a private dbus-daemon and stratisd --sim on it, and stop them on
+    exit. stratisd runs with a private /run, as in _stratisd_command.
+
+    :param str stratisd: the stratisd binary
+    :param float timeout: seconds to wait for stratisd to take its name
+    :returns: the address of the bus, once stratisd owns its name on it
+    :rtype: str
+    :raises RuntimeError: if the bus or stratisd can not be started
+    """
+    with tempfile.TemporaryDirectory(prefix="stratis-bus-") as directory:
+        if os.path.commonpath([os.path.realpath(directory), "/run"]) == "/run":
+            raise RuntimeError(
+                f"{directory} is under /run, which stratisd does not see; "
+                "set TMPDIR to a directory elsewhere"
+            )
+
+        config = os.path.join(directory, "bus.conf")
+        with open(config, "w", encoding="utf-8") as file:
+            file.write(_BUS_CONFIG.format(socket=os.path.join(directory, "bus")))
+
+        daemon = await asyncio.create_subprocess_exec(
+            "dbus-daemon",
+            f"--config-file={config}",
+            "--nofork",
+            "--print-address=1",
+            stdout=asyncio.subprocess.PIPE,
+        )
+        try:
+            assert daemon.stdout is not None
+            # dbus-daemon prints its address once it is listening.
+            address = (await daemon.stdout.readline()).decode("utf-8").strip()
+            if not address:
+                raise RuntimeError(
+                    f"dbus-daemon exited with code {await daemon.wait()}"
+                )
+
+            stratisd_process = await asyncio.create_subprocess_exec(
+                *_stratisd_command(stratisd),
+                env=dict(os.environ, DBUS_SYSTEM_BUS_ADDRESS=address),
+                stdout=sys.stderr,
+            )
+            try:
+                bus = await connect(address)
+                try:
+                    await _wait_for_name(bus, _SERVICE, stratisd_process, timeout)
+                finally:
+                    bus.disconnect()
+                yield address
+            finally:
+                await _stop(stratisd_process)
+        finally:
+            await _stop(daemon)
+
+
+async def _run(command, stratisd, timeout):
+    """
+    Run a command against stratisd --sim on a private bus.
+
+    :param command: the command and its arguments
+    :type command: list of str
+    :param str stratisd: the stratisd binary
+    :param float timeout: seconds to wait for stratisd to take its name
+    :returns: the exit code of the command
+    :rtype: int
+    """
+    async with private_stratisd(stratisd, timeout=timeout) as address:
+        process = await asyncio.create_subprocess_exec(
+            *(arg.replace("{}", address) for arg in command),
+            env=dict(os.environ, DBUS_SYSTEM_BUS_ADDRESS=address),
+        )
+        try:
+            return await process.wait()
+        finally:
+            await _stop(process)
+
+
+def main():
+    """
+    Main method
+    """
+
+    parser = gen_parser()
+    args = parser.parse_args()
+
+    try:
+        return asyncio.run(_run(args.command, args.stratisd, args.timeout))
+    except RuntimeError as err:
+        sys.exit(str(err))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
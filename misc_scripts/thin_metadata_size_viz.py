@@ -5,10 +5,27 @@ to output.
 """
 
 import argparse
+import contextlib
+import csv
+import math
+import os
+import sqlite3
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
+import _sweep
 import numpy
-from matplotlib import pyplot
+
+# thin pool metadata is made up of 4 KiB blocks, i.e., 8 sectors
+_METADATA_BLOCK_SIZE = 8
+# a btree leaf holds up to 252 mappings and is estimated to be half full
+_ENTRIES_PER_LEAF = 126
+# a space map bitmap block has a 16 byte header and 2 bits per data block
+_ENTRIES_PER_BITMAP = (4096 - 16) * 4
+
+_BLOCK_SIZE_DEFAULT = 2048
+_MAX_LINES_DEFAULT = 50
+_LEVELS_DEFAULT = 20
 
 
 def gen_parser():
@@ -23,19 +40,165 @@ def gen_parser():
         )
     )
 
-    block_size_default = "2048"
     parser.add_argument(
         "--block-size",
-        help=f"block size in sectors (default is {block_size_default})",
-        default=block_size_default,
-        dest="block_size",
+        help=(
+            f"block size in sectors, may be given more than once (default is "
+            f"{_BLOCK_SIZE_DEFAULT})"
+        ),
+        action="extend",
+        nargs="+",
+        dest="block_sizes",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--jobs",
+        help=(
+            "maximum number of thin_metadata_size processes to run at once "
+            "(default is the number of CPUs)"
+        ),
+        default=os.cpu_count(),
+        type=int,
+    )
+
+    parser.add_argument(
+        "--estimate",
+        help=(
+            "compute metadata sizes with a built-in model of "
+            "thin_metadata_size instead of running it for every point"
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--validate",
+        help=(
+            "with --estimate, check the model against thin_metadata_size at "
+            "this many random points and report the maximum deviation"
+        ),
+        default=0,
+        metavar="SAMPLES",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--scale",
+        help="spacing of values along both axes (default is linear)",
+        choices=["linear", "log"],
+        default="linear",
+    )
+    parser.add_argument(
+        "--adaptive",
+        help=(
+            "start from the given ranges and refine the grid where the "
+            "metadata size changes by more than the tolerance"
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--tolerance",
+        help=(
+            "with --adaptive, the largest acceptable change in metadata size "
+            "between neighboring points, as a fraction of its total range "
+            "(default is 0.02)"
+        ),
+        default=0.02,
+        type=float,
+    )
+    parser.add_argument(
+        "--budget",
+        help=(
+            "with --adaptive, the maximum number of points to evaluate "
+            "(default is 2000)"
+        ),
+        default=2000,
+        type=int,
+    )
+
+    cache_default = os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "thin_metadata_size.sqlite",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--cache",
+        help=f"path of the results cache (default is {cache_default})",
+        default=cache_default,
+    )
+    cache_group.add_argument(
+        "--no-cache",
+        help="do not read or write the results cache",
+        action="store_const",
+        const=None,
+        dest="cache",
+    )
+    parser.add_argument(
+        "--import-cache",
+        help="CSV file of results to add to the cache before the sweep",
+        dest="import_cache",
+    )
+    parser.add_argument(
+        "--export-cache",
+        help="CSV file to write all cached results to after the sweep",
+        dest="export_cache",
+    )
+
+    parser.add_argument(
+        "--dataset",
+        help=(
+            "file to write the results to, as NumPy arrays if it ends in "
+            "'.npz', otherwise as CSV"
+        ),
+    )
+    parser.add_argument(
+        "--no-plot", help="do not draw the graph", action="store_false", dest="plot"
+    )
+    parser.add_argument(
+        "--render",
+        help=(
+            "how to draw the graph: 3-d wireframe, 3-d rasterized surface, "
+            "rasterized heatmap, or contour lines (default is wireframe)"
+        ),
+        choices=["wireframe", "surface", "heatmap", "contour"],
+        default="wireframe",
+    )
+    parser.add_argument(
+        "--max-lines",
+        help=(
+            "maximum number of lines drawn in each direction by wireframe "
+            f"and surface plots (default is {_MAX_LINES_DEFAULT})"
+        ),
+        default=_MAX_LINES_DEFAULT,
+        dest="max_lines",
+        type=int,
+    )
+    parser.add_argument(
+        "--levels",
+        help=f"number of contour levels (default is {_LEVELS_DEFAULT})",
+        default=_LEVELS_DEFAULT,
+        type=int,
+    )
+    parser.add_argument(
+        "--output",
+        help=(
+            "file to draw the graph to; the format, e.g., SVG or PNG, is "
+            "chosen by its extension (default is metadata.svg)"
+        ),
+        default="metadata.svg",
+    )
+    parser.add_argument(
+        "--dpi",
+        help="resolution of raster output and rasterized elements (default is 100)",
+        default=100,
+        type=int,
     )
 
     parser.add_argument(
         "pool_size",
         help=(
             "comma-separated triple representing pool size range: minimum "
-            "and maximum in sectors, followed by the number of divisions"
+            "and maximum in sectors, followed by the number of divisions; "
+            "or a sweep, KIND:ARGS, as for filesystem_size_input.py --sweep"
         ),
     )
     parser.add_argument(
@@ -43,77 +206,526 @@ def gen_parser():
         help=(
             "comma-separated triple representing range of maximum number of "
             "thin devices in pool: minimum and maximum in sectors, followed by "
-            "the number of divisions"
+            "the number of divisions; or a sweep, KIND:ARGS"
         ),
     )
     return parser
 
 
-def build_arrays(block_size, values):
+class ResultCache:
+    """
+    On-disk cache of thin_metadata_size results, keyed by the version of
+    thin_metadata_size and its inputs.
+    """
+
+    _COLUMNS = ("version", "block_size", "pool_size", "max_thins", "metadata_size")
+
+    def __init__(self, path, version):
+        """
+        Initializer.
+
+        :param str path: path of the SQLite database
+        :param str version: the thin_metadata_size version
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.version = version
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "version TEXT, block_size INTEGER, pool_size INTEGER, "
+            "max_thins INTEGER, metadata_size INTEGER NOT NULL, "
+            "PRIMARY KEY (version, block_size, pool_size, max_thins)"
+            ") WITHOUT ROWID"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._connection.close()
+
+    def get(self, block_size, pool_size, num_thins):
+        """
+        Look up a result.
+
+        :returns: the metadata size or None if not cached
+        :rtype: int or NoneType
+        """
+        row = self._connection.execute(
+            "SELECT metadata_size FROM results WHERE version = ? AND "
+            "block_size = ? AND pool_size = ? AND max_thins = ?",
+            (self.version, int(block_size), int(pool_size), int(num_thins)),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, block_size, results):
+        """
+        Store results.
+
+        :param int block_size: block size in sectors
+        :param results: triples of pool size, number of thins, metadata size
+        :type results: iterable of (int * int * int)
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (
+                    (self.version, int(block_size), int(x), int(y), int(z))
+                    for (x, y, z) in results
+                ),
+            )
+
+    def export_csv(self, path):
+        """
+        Write every cached result, for all versions, to a CSV file.
+
+        :param str path: the CSV file
+        """
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self._COLUMNS)
+            writer.writerows(
+                self._connection.execute(
+                    f"SELECT {', '.join(self._COLUMNS)} FROM results ORDER BY "
+                    "version, block_size, pool_size, max_thins"
+                )
+            )
+
+    def import_csv(self, path):
+        """
+        Add the results in a CSV file written by export_csv to the cache.
+
+        :param str path: the CSV file
+        """
+        with open(path, encoding="utf-8", newline="") as file:
+            reader = csv.DictReader(file)
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (tuple(row[column] for column in self._COLUMNS) for row in reader),
+                )
+
+
+def _thin_metadata_size_version():
+    """
+    Get the version of thin_metadata_size.
+
+    :rtype: str
+    """
+    result = subprocess.run(
+        ["thin_metadata_size", "--version"], capture_output=True, check=True, text=True
+    )
+    return result.stdout.strip()
+
+
+def _thin_metadata_size(block_size, pool_size, num_thins):
+    """
+    Run thin_metadata_size once.
+
+    :param int block_size: block size in sectors
+    :param int pool_size: pool size in sectors
+    :param int num_thins: maximum number of thin devices
+
+    :returns: the metadata size
+    :rtype: int
+    :raises RuntimeError: if thin_metadata_size did not return a number
+    """
+    command = [
+        "thin_metadata_size",
+        f"--block-size={block_size}",
+        f"--pool-size={pool_size}",
+        f"--max-thins={num_thins}",
+        "-n",
+    ]
+    result = subprocess.run(command, capture_output=True, check=False, text=True)
+    try:
+        return int(result.stdout.strip())
+    except ValueError as err:
+        raise RuntimeError(result.stderr.strip()) from err
+
+
+def build_arrays(block_size, x_values, y_values, *, jobs=None, cache=None):
     """
     Build three matrices of values where the z_values are the result of
     running thin_metadata_size on the x and y values.
 
     :param int block_size: block size in sectors
-    :param values: the matrix of pairs of arguments
+    :param x_values: an array of pool sizes in sectors
+    :param y_values: an array, of the same shape, of numbers of thin devices
+    :param jobs: maximum number of concurrent thin_metadata_size processes
+    :type jobs: int or NoneType
+    :param cache: cache of previously computed results
+    :type cache: ResultCache or NoneType
 
     :returns: a triple of arrays for x, y, and z values
+    :raises RuntimeError: listing every point for which thin_metadata_size failed
     """
+    z_values = numpy.zeros(x_values.shape, dtype=numpy.int64)
 
-    (x_values, y_values, z_values) = ([], [], [])
-    for row in values:
-        (x_row, y_row, z_row) = ([], [], [])
-        for pool_size, num_thins in row:
-            command = [
-                "thin_metadata_size",
-                f"--block-size={block_size}",
-                f"--pool-size={pool_size}",
-                f"--max-thins={num_thins}",
-                "-n",
-            ]
-            with subprocess.Popen(
-                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            ) as proc:
-                try:
-                    stdout = proc.stdout
-                    assert stdout is not None, "stdout set in subprocess call"
-                    result = int(stdout.readline().decode("utf-8").strip())
-                except ValueError as err:
-                    stderr = proc.stderr
-                    assert stderr is not None, "stderr set in subprocess call"
-                    error_message = stderr.readline()
-                    raise RuntimeError(error_message.decode("utf-8")) from err
-            x_row.append(pool_size)
-            y_row.append(num_thins)
-            z_row.append(result)
-        x_values.append(x_row)
-        y_values.append(y_row)
-        z_values.append(z_row)
-
-    return (numpy.array(x_values), numpy.array(y_values), numpy.array(z_values))
-
-
-def plot_figure(x_inputs, y_inputs, z_inputs):
-    """
-    Plot a 3-d representation of the data.
+    missing = []
+    for index in numpy.ndindex(x_values.shape):
+        result = (
+            None
+            if cache is None
+            else cache.get(block_size, x_values[index], y_values[index])
+        )
+        if result is None:
+            missing.append(index)
+        else:
+            z_values[index] = result
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            index: executor.submit(
+                _thin_metadata_size, block_size, x_values[index], y_values[index]
+            )
+            for index in missing
+        }
+        for index, future in futures.items():
+            try:
+                z_values[index] = future.result()
+            except RuntimeError as err:
+                errors.append(
+                    f"pool size {x_values[index]}, max thins {y_values[index]}: {err}"
+                )
 
+    if cache is not None:
+        cache.put(
+            block_size,
+            (
+                (x_values[index], y_values[index], z_values[index])
+                for (index, future) in futures.items()
+                if future.exception() is None
+            ),
+        )
+
+    if errors:
+        raise RuntimeError(
+            "thin_metadata_size failed for some inputs:\n" + "\n".join(errors)
+        )
+
+    return (x_values, y_values, z_values)
+
+
+def estimate_arrays(block_size, x_values, y_values):
+    """
+    Estimate the metadata size for every pair of x and y values at once,
+    using the same btree arithmetic as thin_metadata_size rather than
+    running it.
+
+    Data mappings are held in btree leaves, assumed to be half full. Each
+    thin device needs a root node, and the data space map needs one bitmap
+    block for every _ENTRIES_PER_BITMAP data blocks. All sizes are in
+    sectors.
+
+    :param int block_size: block size in sectors
+    :param x_values: an array of pool sizes in sectors
+    :param y_values: an array, of the same shape, of numbers of thin devices
+
+    :returns: a triple of arrays for x, y, and z values
+    """
+    x_values = numpy.asarray(x_values, dtype=numpy.int64)
+    y_values = numpy.asarray(y_values, dtype=numpy.int64)
+
+    nr_blocks = -(-x_values // block_size)
+    mapping_size = -(-nr_blocks // _ENTRIES_PER_LEAF) * _METADATA_BLOCK_SIZE
+    roots_size = y_values * _METADATA_BLOCK_SIZE
+    space_map_size = -(-nr_blocks // _ENTRIES_PER_BITMAP) * _METADATA_BLOCK_SIZE
+
+    return (x_values, y_values, mapping_size + roots_size + space_map_size)
+
+
+def validate_estimate(block_size, x_values, y_values, samples, *, jobs=None):
+    """
+    Compare the estimate against thin_metadata_size at randomly chosen
+    points and print the largest deviation.
+
+    :param int block_size: block size in sectors
+    :param x_values: an array of pool sizes in sectors
+    :param y_values: an array, of the same shape, of numbers of thin devices
+    :param int samples: the number of points to check
+    :param jobs: maximum number of concurrent thin_metadata_size processes
+    :type jobs: int or NoneType
+    """
+    indices = numpy.random.default_rng().choice(
+        x_values.size, size=min(samples, x_values.size), replace=False
+    )
+    x_sample = x_values.ravel()[indices]
+    y_sample = y_values.ravel()[indices]
+
+    (_, _, expected) = build_arrays(block_size, x_sample, y_sample, jobs=jobs)
+    (_, _, estimated) = estimate_arrays(block_size, x_sample, y_sample)
+
+    deviation = numpy.abs(estimated - expected)
+    worst = numpy.argmax(deviation)
+    print(
+        f"Checked {indices.size} points, maximum deviation {deviation[worst]} "
+        f"sectors ({100 * deviation[worst] / max(expected[worst], 1):.2f}%) at "
+        f"pool size {x_sample[worst]}, max thins {y_sample[worst]}"
+    )
+
+
+def write_dataset(path, block_sizes, x_inputs, y_inputs, z_inputs):
+    """
+    Write the results of a sweep to a file.
+
+    An ".npz" file holds the block sizes, the x and y grids, and z indexed
+    by block size, y, and x. Any other file is written as CSV, one row per
+    point.
+
+    :param str path: the file to write
+    :param block_sizes: the block sizes in sectors
+    :type block_sizes: list of int
     :param x_inputs: an array of x values
     :param y_inputs: an array of y values
-    :param z_inputs: an array of z values
+    :param z_inputs: an array of z values for each block size
+    """
+    if path.endswith(".npz"):
+        numpy.savez_compressed(
+            path,
+            block_size=numpy.array(block_sizes),
+            pool_size=x_inputs,
+            max_thins=y_inputs,
+            metadata_size=z_inputs,
+        )
+        return
+
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(("block_size", "pool_size", "max_thins", "metadata_size"))
+        for block_size, z_values in zip(block_sizes, z_inputs):
+            writer.writerows(
+                zip(
+                    [block_size] * z_values.size,
+                    x_inputs.ravel().tolist(),
+                    y_inputs.ravel().tolist(),
+                    z_values.ravel().tolist(),
+                )
+            )
+
+
+def _plot_3d(fig, block_sizes, inputs, *, render, max_lines):
+    """
+    Plot all block sizes on one set of 3-d axes, as a wireframe or a
+    rasterized surface, with at most max_lines lines in each direction.
     """
-    fig = pyplot.figure()
+    (x_inputs, y_inputs, z_inputs) = inputs
     axes = fig.add_subplot(
         projection="3d",
         xlabel="Pool Size",
         ylabel="Number of thin devices",
         zlabel="Metadata size",
     )
-    axes.plot_wireframe(  # pyright: ignore [ reportAttributeAccessIssue ]
-        x_inputs, y_inputs, z_inputs
-    )
+    for block_size, z_values in zip(block_sizes, z_inputs):
+        counts = {
+            "rcount": min(z_values.shape[0], max_lines),
+            "ccount": min(z_values.shape[1], max_lines),
+            "label": f"block size {block_size}",
+        }
+        if render == "surface":
+            axes.plot_surface(  # pyright: ignore [ reportAttributeAccessIssue ]
+                x_inputs, y_inputs, z_values, rasterized=True, **counts
+            )
+        else:
+            axes.plot_wireframe(  # pyright: ignore [ reportAttributeAccessIssue ]
+                x_inputs, y_inputs, z_values, **counts
+            )
+    if len(block_sizes) > 1:
+        axes.legend()
+
+
+def _plot_2d(fig, block_sizes, inputs, *, render, levels):
+    """
+    Plot each block size on its own 2-d axes, as a rasterized heatmap or as
+    contour lines.
+    """
+    (x_inputs, y_inputs, z_inputs) = inputs
+    for index, (block_size, z_values) in enumerate(zip(block_sizes, z_inputs)):
+        axes = fig.add_subplot(
+            1,
+            len(block_sizes),
+            index + 1,
+            title=f"Metadata size, block size {block_size}",
+            xlabel="Pool Size",
+            ylabel="Number of thin devices",
+        )
+        if render == "heatmap":
+            mappable = axes.pcolormesh(
+                x_inputs, y_inputs, z_values, shading="nearest", rasterized=True
+            )
+        else:
+            mappable = axes.contour(x_inputs, y_inputs, z_values, levels=levels)
+            axes.clabel(mappable, fontsize="x-small")
+        fig.colorbar(mappable, ax=axes)
+
+
+def plot_figure(block_sizes, x_inputs, y_inputs, z_inputs, **kwargs):
+    """
+    Plot a representation of the data, one per block size.
+
+    The figure is drawn with the non-interactive Agg backend, so no display
+    is needed. Wireframes and surfaces are drawn with a bounded number of
+    lines, and surfaces and heatmaps are rasterized, so that the size of
+    the figure does not grow with the size of the grid.
+
+    :param block_sizes: the block sizes in sectors
+    :type block_sizes: list of int
+    :param x_inputs: an array of x values
+    :param y_inputs: an array of y values
+    :param z_inputs: an array of z values for each block size
+    :keyword str render: wireframe, surface, heatmap, or contour
+    :keyword int max_lines: maximum lines in each direction for 3-d plots
+    :keyword int levels: number of contour levels
+    """
+    # matplotlib is only needed for plotting, not for a --no-plot sweep.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: PLC0415
+    from matplotlib.figure import Figure  # noqa: PLC0415
+
+    render = kwargs.get("render", "wireframe")
+    inputs = (x_inputs, y_inputs, z_inputs)
+
+    if render in ("wireframe", "surface"):
+        fig = Figure()
+        _plot_3d(
+            fig,
+            block_sizes,
+            inputs,
+            render=render,
+            max_lines=kwargs.get("max_lines", _MAX_LINES_DEFAULT),
+        )
+    else:
+        fig = Figure(figsize=(6.4 * len(block_sizes), 4.8), layout="constrained")
+        _plot_2d(
+            fig,
+            block_sizes,
+            inputs,
+            render=render,
+            levels=kwargs.get("levels", _LEVELS_DEFAULT),
+        )
+
+    FigureCanvasAgg(fig)
     return fig
 
 
+def _axis(range_arg, name, *, log_scale=False):
+    """
+    Build the values along one axis from a comma-separated triple, or from a
+    sweep specification.
+
+    :param str range_arg: minimum, maximum, and number of divisions, or
+        KIND:ARGS
+    :param str name: the name of the axis, for error messages
+    :param bool log_scale: whether to space the values of a triple
+        geometrically
+    :returns: an array of distinct integers, in increasing order
+    """
+    try:
+        if ":" in range_arg:
+            return numpy.unique(_sweep.parse(range_arg))
+
+        (minimum, maximum, intervals) = [int(x) for x in range_arg.split(",")]
+        return (_sweep.log_uniform if log_scale else _sweep.linear)(
+            minimum, maximum, intervals
+        )
+    except ValueError as err:
+        raise RuntimeError(f"{name} range {range_arg}: {err}") from err
+
+
+def _midpoint(low, high, *, log_scale=False):
+    """
+    The integer midpoint of an interval, geometric if log_scale.
+    """
+    (low, high) = (int(low), int(high))
+    return math.isqrt(low * high) if log_scale else (low + high) // 2
+
+
+def _interval_changes(z_values, axis):
+    """
+    For each interval along the given grid axis, the largest difference in z
+    between its endpoints over the other grid axis and all block sizes.
+
+    :param z_values: z values indexed by block size, y, and x
+    :param int axis: 0 for intervals along y, 1 for intervals along x
+    """
+    changes = numpy.abs(numpy.diff(z_values, axis=axis + 1))
+    return changes.max(axis=(0, 2 - axis))
+
+
+def adaptive_arrays(evaluate, axes, *, tolerance, budget, log_scale=False):
+    """
+    Evaluate on a grid which starts at the given axes and is refined, a row
+    or column at a time, in those intervals where z changes by more than
+    tolerance, until nothing is left to refine or the next refinement would
+    exceed the evaluation budget. Refinements with the largest change in z
+    are made first.
+
+    :param evaluate: function computing z for arrays of x and y values, for
+        every block size, with block size as the first axis
+    :param axes: initial values along the x and y axes
+    :type axes: pair of arrays
+    :param float tolerance: largest acceptable change, as a fraction of the
+        range of z for the same block size, between neighboring points
+    :param int budget: maximum number of points to evaluate
+    :param bool log_scale: whether to split intervals geometrically
+    :returns: a triple of arrays for x, y, and z values
+    """
+    (x_axis, y_axis) = axes
+    known = {}
+    while True:
+        (x_values, y_values) = numpy.meshgrid(x_axis, y_axis)
+        missing = [
+            point
+            for point in zip(x_values.ravel().tolist(), y_values.ravel().tolist())
+            if point not in known
+        ]
+        if missing:
+            (x_missing, y_missing) = (numpy.array(values) for values in zip(*missing))
+            known.update(zip(missing, evaluate(x_missing, y_missing).T.tolist()))
+
+        z_values = numpy.array(
+            [
+                known[point]
+                for point in zip(x_values.ravel().tolist(), y_values.ravel().tolist())
+            ]
+        ).T.reshape((-1,) + x_values.shape)
+
+        ranges = z_values.max(axis=(1, 2)) - z_values.min(axis=(1, 2))
+        normalized = z_values / numpy.maximum(ranges, 1)[:, None, None]
+        candidates = sorted(
+            [
+                (change, axis, index)
+                for axis in (0, 1)
+                for (index, change) in enumerate(_interval_changes(normalized, axis))
+                if change > tolerance
+            ],
+            reverse=True,
+        )
+
+        (new_x, new_y) = (set(), set())
+        for _, axis, index in candidates:
+            (values, new_values) = (y_axis, new_y) if axis == 0 else (x_axis, new_x)
+            midpoint = _midpoint(values[index], values[index + 1], log_scale=log_scale)
+            if midpoint in (values[index], values[index + 1]):
+                continue
+
+            # The grid only grows, so its size is the number of evaluations.
+            columns = len(x_axis) + len(new_x) + (1 if axis == 1 else 0)
+            rows = len(y_axis) + len(new_y) + (1 if axis == 0 else 0)
+            if columns * rows > budget:
+                break
+            new_values.add(midpoint)
+
+        if not new_x and not new_y:
+            print(
+                f"Evaluated {len(known)} points for a {len(x_axis)}x{len(y_axis)} grid"
+            )
+            return (x_values, y_values, z_values)
+
+        x_axis = numpy.union1d(x_axis, sorted(new_x)).astype(numpy.int64)
+        y_axis = numpy.union1d(y_axis, sorted(new_y)).astype(numpy.int64)
+
+
 def main():
     """
     Main method
@@ -122,39 +734,79 @@ def main():
     parser = gen_parser()
     args = parser.parse_args()
 
-    block_size = args.block_size
-    (min_pool_size, max_pool_size, pool_size_intervals) = [
-        int(x) for x in args.pool_size.split(",")
-    ]
-    (min_num_thins, max_num_thins, num_thins_intervals) = [
-        int(x) for x in args.max_thins.split(",")
-    ]
+    for option, value in (
+        ("--import-cache", args.import_cache),
+        ("--export-cache", args.export_cache),
+    ):
+        if value is not None and args.estimate:
+            parser.error(f"{option} can not be used with --estimate")
+        if value is not None and args.cache is None:
+            parser.error(f"{option} can not be used with --no-cache")
 
-    pool_size_step = (max_pool_size - min_pool_size) // pool_size_intervals
-    if pool_size_step <= 0:
-        raise RuntimeError(
-            f"Pool size increment is {pool_size_step} which is not a positive number"
-        )
+    block_sizes = (
+        [_BLOCK_SIZE_DEFAULT] if args.block_sizes is None else args.block_sizes
+    )
+    log_scale = args.scale == "log"
+    x_axis = _axis(args.pool_size, "Pool size", log_scale=log_scale)
+    y_axis = _axis(args.max_thins, "Number of thin devices", log_scale=log_scale)
 
-    num_thins_step = (max_num_thins - min_num_thins) // num_thins_intervals
-    if num_thins_step <= 0:
-        raise RuntimeError(
-            f"Number of thin devices increment is {num_thins_step} which is not a positive number"
-        )
+    with (
+        contextlib.nullcontext()
+        if args.estimate or args.cache is None
+        else ResultCache(args.cache, _thin_metadata_size_version())
+    ) as cache:
+        if cache is not None and args.import_cache is not None:
+            cache.import_csv(args.import_cache)
 
-    x_values = list(
-        range(min_pool_size, max_pool_size + pool_size_step, pool_size_step)
-    )
-    y_values = list(
-        range(min_num_thins, max_num_thins + num_thins_step, num_thins_step)
-    )
+        def evaluate(x_values, y_values):
+            return numpy.stack(
+                [
+                    (
+                        estimate_arrays(block_size, x_values, y_values)
+                        if args.estimate
+                        else build_arrays(
+                            block_size, x_values, y_values, jobs=args.jobs, cache=cache
+                        )
+                    )[2]
+                    for block_size in block_sizes
+                ]
+            )
 
-    values = [[(x, y) for x in x_values] for y in y_values]
+        if args.adaptive:
+            (x_inputs, y_inputs, z_inputs) = adaptive_arrays(
+                evaluate,
+                (x_axis, y_axis),
+                tolerance=args.tolerance,
+                budget=args.budget,
+                log_scale=log_scale,
+            )
+        else:
+            (x_inputs, y_inputs) = numpy.meshgrid(x_axis, y_axis)
+            z_inputs = evaluate(x_inputs, y_inputs)
 
-    (x_inputs, y_inputs, z_inputs) = build_arrays(block_size, values)
+        if args.estimate and args.validate > 0:
+            for block_size in block_sizes:
+                validate_estimate(
+                    block_size, x_inputs, y_inputs, args.validate, jobs=args.jobs
+                )
 
-    fig = plot_figure(x_inputs, y_inputs, z_inputs)
-    fig.savefig("metadata.svg")
+        if cache is not None and args.export_cache is not None:
+            cache.export_csv(args.export_cache)
+
+    if args.dataset is not None:
+        write_dataset(args.dataset, block_sizes, x_inputs, y_inputs, z_inputs)
+
+    if args.plot:
+        fig = plot_figure(
+            block_sizes,
+            x_inputs,
+            y_inputs,
+            z_inputs,
+            render=args.render,
+            max_lines=args.max_lines,
+            levels=args.levels,
+        )
+        fig.savefig(args.output, dpi=args.dpi)
 
 
 if __name__ == "__main__":
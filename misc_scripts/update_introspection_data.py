@@ -18,18 +18,24 @@ Update Stratis introspection data.
 """
 
 import argparse
+import asyncio
+import hashlib
+import json
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
 import xml.etree.ElementTree as ET
 from enum import Enum
 from typing import List, Mapping, MutableMapping, Sequence
 
 import dbus
+from _async_client import ProxyFactory, connect
+from _proxies import proxy_classes
 from dbus.proxies import ProxyObject
 from semantic_version import Version
 
-from dbus_python_client_gen import make_class
-
 
 class ProxyType(Enum):
     """
@@ -66,6 +72,12 @@ SPECS = {
 <arg name="return_code" type="q" direction="out"/>
 <arg name="return_string" type="s" direction="out"/>
 </method>
+<method name="DestroyPool">
+<arg name="pool" type="o" direction="in" />
+<arg name="result" type="(bs)" direction="out" />
+<arg name="return_code" type="q" direction="out" />
+<arg name="return_string" type="s" direction="out" />
+</method>
 <property name="Version" type="s" access="read">
 <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal" value="const" />
 </property>
@@ -79,22 +91,30 @@ SPECS = {
 <arg name="return_code" type="q" direction="out"/>
 <arg name="return_string" type="s" direction="out"/>
 </method>
+<method name="DestroyFilesystems">
+<arg name="filesystems" type="ao" direction="in" />
+<arg name="results" type="(bas)" direction="out" />
+<arg name="return_code" type="q" direction="out" />
+<arg name="return_string" type="s" direction="out" />
+</method>
+<property name="Name" type="s" access="read" />
+<property name="TotalPhysicalSize" type="s" access="read" />
+<property name="TotalPhysicalUsed" type="(bs)" access="read" />
 </interface>
 """,
 }
 
 _SERVICE = "org.storage.stratis3"
+_TOP_OBJECT = "/org/storage/stratis3"
 
 _INTROSPECTABLE_IFACE = "org.freedesktop.DBus.Introspectable"
 _MANAGER_IFACE = "org.storage.stratis3.Manager.r0"
 _POOL_IFACE = "org.storage.stratis3.pool.r0"
 _TIMEOUT = 120000
 
-Introspectable = make_class(
-    "Introspectable", ET.fromstring(SPECS[_INTROSPECTABLE_IFACE]), _TIMEOUT
+(Introspectable, Manager, Pool) = proxy_classes(
+    SPECS, [_INTROSPECTABLE_IFACE, _MANAGER_IFACE, _POOL_IFACE], _TIMEOUT
 )
-Manager = make_class("Manager", ET.fromstring(SPECS[_MANAGER_IFACE]), _TIMEOUT)
-Pool = make_class("Pool", ET.fromstring(SPECS[_POOL_IFACE]), _TIMEOUT)
 
 OBJECT_MANAGER_INTERFACE = "org.freedesktop.DBus.ObjectManager"
 
@@ -106,16 +126,79 @@ POOL_OBJECT_INTERFACE_PREFIXES = ["org.storage.stratis3.pool"]
 BLOCKDEV_OBJECT_INTERFACE_PREFIXES = ["org.storage.stratis3.blockdev"]
 FILESYSTEM_OBJECT_INTERFACE_PREFIXES = ["org.storage.stratis3.filesystem"]
 
+_STRATISD_DEFAULT = shutil.which("stratisd") or "/usr/libexec/stratisd"
+
+
+# The order of the attributes of an element in canonical form; any others
+# follow, in alphabetical order.
+_ATTRIBUTE_ORDER = ["name", "type", "direction", "access", "value"]
+
 
-def _xml_object_to_str(xml_object: ET.Element) -> str:
+def _canonicalize(xml_object: ET.Element):
     """
-    Convert XML object read from D-Bus to a string.
+    Put XML object read from D-Bus in canonical form, in place, so that the
+    same interface is always converted to the same string, whatever order
+    or indentation stratisd introspects it in.
+
+    Children are sorted by tag and name at every level, except arguments,
+    whose order is significant. Attributes are put in a fixed order, and
+    whitespace between elements is dropped, to be replaced by ET.indent.
     """
+    xml_object[:] = sorted(
+        xml_object,
+        key=lambda child: (
+            child.tag,
+            "" if child.tag == "arg" else child.get("name", ""),
+        ),
+    )
+
+    attributes = sorted(
+        xml_object.attrib.items(),
+        key=lambda item: (
+            _ATTRIBUTE_ORDER.index(item[0])
+            if item[0] in _ATTRIBUTE_ORDER
+            else len(_ATTRIBUTE_ORDER),
+            item[0],
+        ),
+    )
+    xml_object.attrib.clear()
+    xml_object.attrib.update(attributes)
+
+    if xml_object.text is not None and not xml_object.text.strip():
+        xml_object.text = None
+    if xml_object.tail is not None and not xml_object.tail.strip():
+        xml_object.tail = None
+
+    for child in xml_object:
+        _canonicalize(child)
+
+
+def _xml_object_to_str(xml_object: ET.Element, *, canonical: bool = False) -> str:
+    """
+    Convert XML object read from D-Bus to a string, in canonical form if
+    canonical is set.
+    """
+    if canonical:
+        _canonicalize(xml_object)
+        ET.indent(xml_object)
+        return ET.tostring(xml_object).decode("utf-8")
+
     xml_object[:] = sorted(xml_object, key=lambda child: (child.tag, child.get("name")))
     return ET.tostring(xml_object).decode("utf-8").rstrip(" \n")
 
 
-def setup_minimal_object_set(bus: dbus.SystemBus) -> dict[ProxyType, ProxyObject]:
+def _get_bus(bus_address: str | None) -> dbus.bus.BusConnection:
+    """
+    Get the bus at the specified address, or the system bus.
+    """
+    return (
+        dbus.SystemBus() if bus_address is None else dbus.bus.BusConnection(bus_address)
+    )
+
+
+def setup_minimal_object_set(
+    bus: dbus.bus.BusConnection,
+) -> dict[ProxyType, ProxyObject]:
     """
     Set up the minimal set of objects to be introspected on.
 
@@ -123,7 +206,7 @@ def setup_minimal_object_set(bus: dbus.SystemBus) -> dict[ProxyType, ProxyObject
     :returns: a dict of proxy objects
     :rtype: dict of str * dbus proxy object
     """
-    proxy = bus.get_object(_SERVICE, "/org/storage/stratis3", introspect=False)
+    proxy = bus.get_object(_SERVICE, _TOP_OBJECT, introspect=False)
 
     ((_, (pool_object_path, dev_object_paths)), return_code, return_msg) = (
         Manager.Methods.CreatePool(
@@ -165,14 +248,75 @@ def setup_minimal_object_set(bus: dbus.SystemBus) -> dict[ProxyType, ProxyObject
     }
 
 
-def _get_revision_ext(
-    manager: ProxyObject, maybe_revision_number: int | None = None
-) -> str:
+def introspect(proxies: Mapping[ProxyType, ProxyObject]) -> dict[ProxyType, str]:
+    """
+    Introspect on every proxy.
+
+    :param proxies: the proxy objects
+    :returns: the introspection data for each proxy
+    """
+    return {
+        proxy_type: Introspectable.Methods.Introspect(proxy_object, {})
+        for (proxy_type, proxy_object) in proxies.items()
+    }
+
+
+async def introspect_async(bus_address: str | None) -> tuple[dict[ProxyType, str], str]:
+    """
+    Set up the minimal set of objects and introspect on all of them at once,
+    with the asyncio client.
+
+    :param bus_address: address of the bus, or None for the system bus
+    :returns: the introspection data for each proxy and the stratisd version
+    """
+    bus = await connect(bus_address)
+    factory = ProxyFactory(bus, _SERVICE, SPECS)
+    manager = factory.interface(_TOP_OBJECT, _MANAGER_IFACE)
+
+    (
+        (_, (pool_object_path, dev_object_paths)),
+        return_code,
+        return_msg,
+    ) = await manager.call_create_pool(
+        "pool_name", [True, 0], ["/fake/fake"], [False, ""], [False, ["", ""]]
+    )
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+    ((_, filesystems), return_code, return_msg) = await factory.interface(
+        pool_object_path, _POOL_IFACE
+    ).call_create_filesystems([["fs_name", [False, ""]]])
+
+    if return_code != 0:
+        sys.exit(return_msg)
+
+    object_paths = {
+        ProxyType.MANAGER: _TOP_OBJECT,
+        ProxyType.POOL: pool_object_path,
+        ProxyType.FILESYSTEM: filesystems[0][0],
+        ProxyType.BLOCKDEV: dev_object_paths[0],
+    }
+
+    (version, *data) = await asyncio.gather(
+        manager.get_version(),
+        *(
+            factory.interface(object_path, _INTROSPECTABLE_IFACE).call_introspect()
+            for object_path in object_paths.values()
+        ),
+    )
+
+    bus.disconnect()
+
+    return (dict(zip(object_paths, data)), version)
+
+
+def _get_revision_ext(version: str, maybe_revision_number: int | None = None) -> str:
     """
     Return revision extension.
     """
     return f"r{
-        Version(Manager.Properties.Version.Get(manager)).minor
+        Version(version).minor
         if maybe_revision_number is None
         else maybe_revision_number
     }"
@@ -187,79 +331,106 @@ def _get_current_interfaces(
     return [f"{prefix}.{revision_ext}" for prefix in interface_prefixes]
 
 
+def _parse_data(data: Mapping[ProxyType, str]) -> dict[ProxyType, ET.Element]:
+    """
+    Parse the introspection data for each proxy, once for all revisions.
+    """
+    return {
+        proxy_type: ET.fromstring(string_data)
+        for (proxy_type, string_data) in data.items()
+    }
+
+
+def _find_interface(xml_data: ET.Element, interface_name: str) -> ET.Element:
+    """
+    Find an interface in the introspection data for one object.
+
+    :raises: RuntimeError if the interface is not found
+    """
+    try:
+        return next(
+            interface
+            for interface in xml_data
+            if interface.attrib["name"] == interface_name
+        )
+    except StopIteration as err:
+        raise RuntimeError(
+            f"interface {interface_name} not found in introspection data"
+        ) from err
+
+
 def _add_data(
     specs: MutableMapping[str, str],
-    proxy_object: ProxyObject,
+    xml_data: ET.Element,
     interfaces: Sequence[str],
+    *,
+    canonical: bool = False,
 ):
     """
-    Introspect on the proxy, get the information for the specified
-    interfaces, and add it to specs.
+    Get the information for the specified interfaces from the introspection
+    data, and add it to specs.
 
-    :param proxy: dbus Proxy object
+    :param xml_data: parsed introspection data for one object
     :param list interfaces: list of interesting interface names
+    :param bool canonical: whether to put the information in canonical form
     :raises: RuntimeError if some interface not found
     """
-    string_data = Introspectable.Methods.Introspect(proxy_object, {})
-    xml_data = ET.fromstring(string_data)
-
     for interface_name in interfaces:
-        try:
-            interface = next(
-                interface
-                for interface in xml_data
-                if interface.attrib["name"] == interface_name
-            )
-            specs[interface_name] = _xml_object_to_str(interface)
-        except StopIteration as err:
-            raise RuntimeError(
-                f"interface {interface_name} not found in introspection data"
-            ) from err
+        specs[interface_name] = _xml_object_to_str(
+            _find_interface(xml_data, interface_name), canonical=canonical
+        )
 
 
 def _add_stratis_specs(
     specs: MutableMapping[str, str],
-    proxies: Mapping[ProxyType, ProxyObject],
+    data: Mapping[ProxyType, ET.Element],
     revision_ext: str,
+    *,
+    canonical: bool = False,
 ):
     """
     Add specs for Stratis interfaces.
     """
     _add_data(
         specs,
-        proxies[ProxyType.MANAGER],
+        data[ProxyType.MANAGER],
         _get_current_interfaces(revision_ext, TOP_OBJECT_INTERFACE_PREFIXES),
+        canonical=canonical,
     )
     _add_data(
         specs,
-        proxies[ProxyType.POOL],
+        data[ProxyType.POOL],
         _get_current_interfaces(revision_ext, POOL_OBJECT_INTERFACE_PREFIXES),
+        canonical=canonical,
     )
 
     _add_data(
         specs,
-        proxies[ProxyType.BLOCKDEV],
+        data[ProxyType.BLOCKDEV],
         _get_current_interfaces(revision_ext, BLOCKDEV_OBJECT_INTERFACE_PREFIXES),
+        canonical=canonical,
     )
     _add_data(
         specs,
-        proxies[ProxyType.FILESYSTEM],
+        data[ProxyType.FILESYSTEM],
         _get_current_interfaces(revision_ext, FILESYSTEM_OBJECT_INTERFACE_PREFIXES),
+        canonical=canonical,
     )
 
 
 def _make_python_spec(
-    proxies: Mapping[ProxyType, ProxyObject], *, revision_number: int | None = None
+    data: Mapping[ProxyType, str], version: str, *, revision_number: int | None = None
 ) -> dict[str, str]:
     """
     Make the introspection spec for python consumption.
     """
-    revision_ext = _get_revision_ext(proxies[ProxyType.MANAGER], revision_number)
+    revision_ext = _get_revision_ext(version, revision_number)
+    xml_data = _parse_data(data)
 
     specs: dict[str, str] = {}
 
-    _add_data(specs, proxies[ProxyType.MANAGER], [OBJECT_MANAGER_INTERFACE])
-    _add_stratis_specs(specs, proxies, revision_ext)
+    _add_data(specs, xml_data[ProxyType.MANAGER], [OBJECT_MANAGER_INTERFACE])
+    _add_stratis_specs(specs, xml_data, revision_ext)
 
     return specs
 
@@ -282,32 +453,221 @@ def _print_python_spec(specs: Mapping[str, str]):
     print("}")
 
 
+def _stratisd_identity(stratisd: str) -> tuple[str, str]:
+    """
+    Identify a stratisd binary without running the daemon.
+
+    :param stratisd: path of the stratisd binary
+    :returns: the version reported by stratisd --version and the SHA-256 hash
+        of the binary
+    """
+    result = subprocess.run(
+        [stratisd, "--version"], capture_output=True, check=True, text=True
+    )
+    with open(stratisd, "rb") as file:
+        digest = hashlib.file_digest(file, "sha256")
+    return (result.stdout.split()[-1], digest.hexdigest())
+
+
+def _cache_entry(namespace: argparse.Namespace) -> tuple[str, str] | None:
+    """
+    Get the path of the cache entry for the stratisd binary, along with the
+    binary's version.
+
+    The cached data is the full introspection data, which contains every
+    interface revision, so the revision number is not part of the key.
+
+    :returns: the path of the cache entry and the version, or None if there
+        is no cache or the binary can not be identified
+    """
+    if namespace.cache_dir is None:
+        return None
+
+    try:
+        (version, binary_hash) = _stratisd_identity(namespace.stratisd)
+    except (OSError, subprocess.CalledProcessError) as err:
+        print(
+            f"Not using the introspection cache, cannot identify "
+            f"{namespace.stratisd}: {err}",
+            file=sys.stderr,
+        )
+        return None
+
+    return (os.path.join(namespace.cache_dir, f"{version}-{binary_hash}.json"), version)
+
+
+def _read_cache(path: str) -> tuple[dict[ProxyType, str], str]:
+    """
+    Read a cache entry.
+
+    :returns: the introspection data for each proxy and the stratisd version
+    """
+    with open(path, encoding="utf-8") as file:
+        entry = json.load(file)
+    return (
+        {ProxyType(key): value for (key, value) in entry["data"].items()},
+        entry["version"],
+    )
+
+
+def _write_cache(path: str, data: Mapping[ProxyType, str], version: str):
+    """
+    Write a cache entry, atomically, so that a concurrent or interrupted run
+    never leaves a partial entry.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False
+    ) as file:
+        json.dump(
+            {
+                "version": version,
+                "data": {str(key): value for (key, value) in data.items()},
+            },
+            file,
+        )
+    os.replace(file.name, path)
+
+
+async def _get_version_async(bus_address: str | None) -> str:
+    """
+    Get the version of the running stratisd, with the asyncio client.
+
+    :param bus_address: address of the bus, or None for the system bus
+    """
+    bus = await connect(bus_address)
+    version = await (
+        ProxyFactory(bus, _SERVICE, SPECS)
+        .interface(_TOP_OBJECT, _MANAGER_IFACE)
+        .get_version()
+    )
+    bus.disconnect()
+    return version
+
+
+def _get_version(namespace: argparse.Namespace) -> str:
+    """
+    Get the version of the running stratisd, setting up no objects.
+    """
+    if namespace.asyncio:
+        return asyncio.run(_get_version_async(namespace.bus_address))
+
+    return Manager.Properties.Version.Get(
+        _get_bus(namespace.bus_address).get_object(
+            _SERVICE, _TOP_OBJECT, introspect=False
+        )
+    )
+
+
+def _get_introspection_data(
+    namespace: argparse.Namespace,
+) -> tuple[dict[ProxyType, str], str]:
+    """
+    Set up the minimal set of objects and introspect on them, unless the
+    data for the stratisd binary is already in the cache, and the running
+    stratisd is the same version as the binary.
+
+    :returns: the introspection data for each proxy and the stratisd version
+    """
+    entry = _cache_entry(namespace)
+    if entry is not None and os.path.exists(entry[0]):
+        (data, version) = _read_cache(entry[0])
+        running_version = _get_version(namespace)
+        if running_version == version:
+            return (data, version)
+        print(
+            f"Not using the introspection cache: the running stratisd is "
+            f"version {running_version}, but {namespace.stratisd} is version "
+            f"{version}",
+            file=sys.stderr,
+        )
+
+    if namespace.asyncio:
+        (data, version) = asyncio.run(introspect_async(namespace.bus_address))
+    else:
+        bus = _get_bus(namespace.bus_address)
+        proxies = setup_minimal_object_set(bus)
+        (data, version) = (
+            introspect(proxies),
+            Manager.Properties.Version.Get(proxies[ProxyType.MANAGER]),
+        )
+
+    if entry is not None:
+        (path, binary_version) = entry
+        if version == binary_version:
+            _write_cache(path, data, version)
+        else:
+            print(
+                f"Not caching introspection data: the running stratisd is "
+                f"version {version}, but {namespace.stratisd} is version "
+                f"{binary_version}",
+                file=sys.stderr,
+            )
+
+    return (data, version)
+
+
 def _python_output(namespace: argparse.Namespace):
     """
     Generate python output
     """
-    bus = dbus.SystemBus()
-    proxies = setup_minimal_object_set(bus)
-    specs = _make_python_spec(proxies, revision_number=namespace.revision_number)
+    (data, version) = _get_introspection_data(namespace)
+    specs = _make_python_spec(data, version, revision_number=namespace.revision_number)
     _print_python_spec(specs)
 
 
 def _make_docs_spec(
-    proxies: Mapping[ProxyType, ProxyObject], revision_number: int | None
+    data: Mapping[ProxyType, str], version: str, revision_number: int | None
 ) -> dict[str, str]:
     """
     Make the introspection spec for use in docs repo.
     """
-    revision_ext = _get_revision_ext(proxies[ProxyType.MANAGER], revision_number)
+    revision_ext = _get_revision_ext(version, revision_number)
     specs: dict[str, str] = {}
-    _add_stratis_specs(specs, proxies, revision_ext)
+    _add_stratis_specs(specs, _parse_data(data), revision_ext, canonical=True)
     return specs
 
 
+def _write_if_changed(path: str, content: str) -> bool:
+    """
+    Write a file, atomically, but only if its content would change, so that
+    an unchanged file is not touched at all.
+
+    :returns: True if the file was written
+    """
+    encoded = content.encode("utf-8")
+    try:
+        with open(path, "rb") as file:
+            if (
+                hashlib.file_digest(file, "sha256").digest()
+                == hashlib.sha256(encoded).digest()
+            ):
+                return False
+    except FileNotFoundError:
+        pass
+
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=os.path.dirname(path), suffix=".tmp", delete=False
+    ) as file:
+        file.write(encoded)
+    try:
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, path)
+    except OSError:
+        os.unlink(file.name)
+        raise
+    return True
+
+
 def _print_docs_spec(specs: Mapping[str, str], namespace: argparse.Namespace):
     """
     Print spec for inclusion on docs website.
 
+    Unless namespace.incremental is set, the output directory must not
+    exist. If it is set, the directory may exist, e.g., a docs checkout, and
+    only the files whose content changes are written.
+
     :param specs: the specification to print
     :type specs: dict of str * str
     :param namespace: the namespace parsed from the command-line arguments
@@ -315,26 +675,170 @@ def _print_docs_spec(specs: Mapping[str, str], namespace: argparse.Namespace):
 
     abs_output_dir = os.path.abspath(namespace.output_dir)
     try:
-        os.mkdir(abs_output_dir)
+        os.makedirs(abs_output_dir, exist_ok=namespace.incremental)
     except FileExistsError as err:
         raise RuntimeError("Cannot create output dir for files") from err
 
-    for interface_name, introspection_data in specs.items():
-        file_path = os.path.join(abs_output_dir, f"{interface_name}.xml")
-        with open(file_path, "w", encoding="utf-8") as file:
-            print(introspection_data, file=file)
+    written = [
+        interface_name
+        for (interface_name, introspection_data) in specs.items()
+        if _write_if_changed(
+            os.path.join(abs_output_dir, f"{interface_name}.xml"),
+            f"{introspection_data}\n",
+        )
+    ]
+
+    if namespace.incremental:
+        print(
+            f"{len(written)} of {len(specs)} interface files changed"
+            + "".join(f"\n  {interface_name}.xml" for interface_name in written),
+            file=sys.stderr,
+        )
 
 
 def _docs_output(namespace: argparse.Namespace):
     """
     Generate python output
     """
-    bus = dbus.SystemBus()
-    proxies = setup_minimal_object_set(bus)
-    specs = _make_docs_spec(proxies, revision_number=namespace.revision_number)
+    (data, version) = _get_introspection_data(namespace)
+    specs = _make_docs_spec(data, version, revision_number=namespace.revision_number)
     _print_docs_spec(specs, namespace)
 
 
+# The interface prefixes of each type of object, in the order to report them.
+_OBJECT_INTERFACE_PREFIXES = [
+    (ProxyType.MANAGER, TOP_OBJECT_INTERFACE_PREFIXES),
+    (ProxyType.POOL, POOL_OBJECT_INTERFACE_PREFIXES),
+    (ProxyType.BLOCKDEV, BLOCKDEV_OBJECT_INTERFACE_PREFIXES),
+    (ProxyType.FILESYSTEM, FILESYSTEM_OBJECT_INTERFACE_PREFIXES),
+]
+
+
+def _revision_numbers(xml_data: Mapping[ProxyType, ET.Element]) -> list[int]:
+    """
+    Get the numbers of all the interface revisions that stratisd provides,
+    from the revisions of the Manager interface.
+    """
+    prefix = f"{TOP_OBJECT_INTERFACE_PREFIXES[0]}.r"
+    return sorted(
+        int(name.removeprefix(prefix))
+        for interface in xml_data[ProxyType.MANAGER]
+        if (name := interface.get("name", "")).startswith(prefix)
+    )
+
+
+def _describe_member(member: ET.Element) -> str:
+    """
+    Describe a method, property, or signal canonically, i.e., so that two
+    members have the same description if and only if they are the same
+    apart from the order of their attributes and annotations.
+    """
+    # The args of a signal have no direction, as all are out; an arg of a
+    # method with no direction is in.
+    args = [
+        (arg.get("direction", "out" if member.tag == "signal" else "in"), arg)
+        for arg in member.findall("arg")
+    ]
+    in_args = ", ".join(
+        f"{arg.get('name')}: {arg.get('type')}"
+        for (direction, arg) in args
+        if direction != "out"
+    )
+    out_args = ", ".join(
+        f"{arg.get('name')}: {arg.get('type')}"
+        for (direction, arg) in args
+        if direction == "out"
+    )
+    annotations = sorted(
+        f"{annotation.get('name')}={annotation.get('value')}"
+        for annotation in member.findall("annotation")
+    )
+
+    description = {
+        "method": f"({in_args}) -> ({out_args})",
+        "property": f"{member.get('type')}, {member.get('access')}",
+        "signal": f"({out_args})",
+    }.get(member.tag, "")
+    return description + (f" [{', '.join(annotations)}]" if annotations else "")
+
+
+def _members(interface: ET.Element) -> dict[tuple[str, str], str]:
+    """
+    Get the canonical description of every member of an interface.
+
+    :returns: description by kind and name of member
+    """
+    return {
+        (member.tag, member.get("name", "")): _describe_member(member)
+        for member in interface
+        if member.tag in ("method", "property", "signal")
+    }
+
+
+def _interface_diff(old: ET.Element, new: ET.Element) -> list[str]:
+    """
+    List the members added, removed, or changed between two revisions of an
+    interface.
+    """
+    (old_members, new_members) = (_members(old), _members(new))
+    lines = []
+    for key in sorted(old_members.keys() | new_members.keys()):
+        (kind, name) = key
+        separator = ": " if kind == "property" else ""
+        if key not in old_members:
+            lines.append(f"+ {kind} {name}{separator}{new_members[key]}")
+        elif key not in new_members:
+            lines.append(f"- {kind} {name}{separator}{old_members[key]}")
+        elif old_members[key] != new_members[key]:
+            lines.append(f"~ {kind} {name}")
+            lines.append(f"    - {old_members[key]}")
+            lines.append(f"    + {new_members[key]}")
+    return lines
+
+
+def _revisions_diff(
+    xml_data: Mapping[ProxyType, ET.Element], revision_numbers: Sequence[int]
+) -> list[str]:
+    """
+    Describe the structural changes in every interface between consecutive
+    revisions.
+    """
+    lines = []
+    for old, new in zip(revision_numbers, revision_numbers[1:]):
+        lines.append(f"r{old} -> r{new}")
+        changed = False
+        for proxy_type, prefixes in _OBJECT_INTERFACE_PREFIXES:
+            for prefix in prefixes:
+                diff = _interface_diff(
+                    _find_interface(xml_data[proxy_type], f"{prefix}.r{old}"),
+                    _find_interface(xml_data[proxy_type], f"{prefix}.r{new}"),
+                )
+                if diff:
+                    changed = True
+                    lines.append(f"  {prefix}")
+                    lines.extend(f"    {line}" for line in diff)
+        if not changed:
+            lines.append("  no changes")
+    return lines
+
+
+def _revisions_output(namespace: argparse.Namespace):
+    """
+    Generate docs output for every revision, and print the changes between
+    consecutive revisions.
+    """
+    (data, _) = _get_introspection_data(namespace)
+    xml_data = _parse_data(data)
+    revision_numbers = _revision_numbers(xml_data)
+
+    specs: dict[str, str] = {}
+    for revision_number in revision_numbers:
+        _add_stratis_specs(specs, xml_data, f"r{revision_number}", canonical=True)
+    _print_docs_spec(specs, namespace)
+
+    print("\n".join(_revisions_diff(xml_data, revision_numbers)))
+
+
 def _gen_parser() -> argparse.ArgumentParser:
     """
     Generate the parser.
@@ -352,6 +856,43 @@ def _gen_parser() -> argparse.ArgumentParser:
         "--revision-number", help="D-Bus interface revision number", type=int
     )
 
+    parser.add_argument(
+        "--bus-address",
+        help="address of the bus to connect to instead of the system bus",
+        dest="bus_address",
+    )
+
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help=(
+            "use the asyncio D-Bus client, which introspects on all objects "
+            "concurrently"
+        ),
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "directory in which to cache introspection data, keyed by the "
+            "version and a hash of the --stratisd binary; on a hit, only the "
+            "running stratisd's version is read, and the cached data is used "
+            "if it is the same version as the binary. A rebuild that keeps "
+            "the version, e.g., of a development branch, is not detected, "
+            "so the cache is off unless this option is given"
+        ),
+        dest="cache_dir",
+    )
+
+    parser.add_argument(
+        "--stratisd",
+        help=(
+            "the stratisd binary, which must be the one running, used to "
+            f"look up the cache (default is {_STRATISD_DEFAULT})"
+        ),
+        default=_STRATISD_DEFAULT,
+    )
+
     subparsers = parser.add_subparsers(title="subcommands")
 
     python_parser = subparsers.add_parser(
@@ -363,8 +904,35 @@ def _gen_parser() -> argparse.ArgumentParser:
         "docs", help="Generate introspection data for consumption by website docs"
     )
     docs_parser.add_argument("output_dir", help="directory for output files")
+    docs_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "write into an existing output dir, e.g., a docs checkout, "
+            "rewriting only the files whose content changes"
+        ),
+    )
     docs_parser.set_defaults(func=_docs_output)
 
+    revisions_parser = subparsers.add_parser(
+        "revisions",
+        help=(
+            "Generate introspection data for every interface revision for "
+            "website docs, and print the changes between consecutive "
+            "revisions; ignores --revision-number"
+        ),
+    )
+    revisions_parser.add_argument("output_dir", help="directory for output files")
+    revisions_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "write into an existing output dir, e.g., a docs checkout, "
+            "rewriting only the files whose content changes"
+        ),
+    )
+    revisions_parser.set_defaults(func=_revisions_output)
+
     parser.set_defaults(func=lambda _: parser.error("missing sub-command"))
 
     return parser
@@ -72,8 +72,8 @@ fi
 
 mkdir upstream
 cd upstream
-git clone https://github.com/stratis-storage/stratisd
-git clone https://github.com/stratis-storage/stratis-cli
+../../cached_clone.py https://github.com/stratis-storage/stratisd stratisd
+../../cached_clone.py https://github.com/stratis-storage/stratis-cli stratis-cli
 cd stratisd
 ../../../release_management/create_artifacts.py ../../SOURCES/ --pre-release --specfile-path=../../SPECS/stratisd.spec stratisd --vendor-method=filtered
 cd ..
@@ -78,8 +78,8 @@ fi
 
 mkdir upstream
 cd upstream
-git clone https://github.com/stratis-storage/stratisd
-git clone https://github.com/stratis-storage/stratis-cli
+../../cached_clone.py https://github.com/stratis-storage/stratisd stratisd
+../../cached_clone.py https://github.com/stratis-storage/stratis-cli stratis-cli
 cd stratisd
 ../../../release_management/create_artifacts.py --specfile-path=../../SPECS/stratisd.spec ../../SOURCES/ stratisd --vendor-method=filtered
 cd ..
@@ -19,20 +19,30 @@ Calculates values useful for making a release.
 
 import os
 import subprocess
+import time
 import tomllib
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from getpass import getpass
-from typing import Any, List, Optional
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, List, Optional
 from urllib.parse import urlparse
 
-import requests
-from github import Github
-from semantic_version import Version
-from specfile import specfile
+# github, requests, semantic_version, and specfile are slow to import and
+# are imported only in the functions that use them, so that entry points
+# which do not need them do not pay for them at startup.
+if TYPE_CHECKING:
+    from semantic_version import Version
+    from specfile import specfile
 
 MANIFEST_PATH = "./Cargo.toml"
 
+_UPLOAD_TIMEOUT = 600
+_UPLOAD_RETRIES = 5
+_UPLOAD_BACKOFF = 2
+_UPLOAD_WORKERS = 4
+
 
 def release_stamp() -> str:
     """
@@ -53,7 +63,7 @@ class ReleaseVersion:
     Release version for the package.
     """
 
-    def __init__(self, base: Version, *, pre: bool = False, post: bool = False):
+    def __init__(self, base: "Version", *, pre: bool = False, post: bool = False):
         """
         Initializer.
         :param Version base: Base version
@@ -74,45 +84,109 @@ class ReleaseVersion:
         return release_stamp() if self.pre or self.post else None
 
 
-def edit_specfile(
+def _apply_specfile_edits(
+    spec: "specfile.Specfile",
+    *,
+    version: Optional[str] = None,
+    release: Optional[str] = None,
+    sources: Optional[List[str]] = None,
+    arbitrary: Optional[Callable[["specfile.Specfile"], None]] = None,
+):
+    """
+    Apply edits to an already opened spec.
+    :param Specfile spec: the spec to edit
+    :param version: version to set in spec file
+    :type version: str or NoneType
+    :param release: release to set in spec file
+    :type release: str or NoneType
+    :param sources: local source files
+    :type sources: list of str or NoneType
+    :param arbitrary: a function that takes the spec and does some action
+    :type arbitrary: Specfile -> NoneType
+    """
+    if version is not None:
+        spec.version = version
+    if release is not None:
+        spec.release = release
+    if sources is not None:
+        with spec.sources() as entries:
+            for index, value in enumerate(sources):
+                entries[index].location = value
+    if arbitrary is not None:
+        arbitrary(spec)
+
+
+def edit_specfiles(
     specfile_path,
+    targets: Mapping[str, Optional[Callable[["specfile.Specfile"], None]]],
     *,
     release_version: Optional[ReleaseVersion] = None,
     sources: Optional[List[str]] = None,
-    arbitrary: Optional[Callable[[specfile.Specfile], None]] = None,
+    arbitrary: Optional[Callable[["specfile.Specfile"], None]] = None,
 ):
     """
-    Edit the specfile in place
-    :param specfile_path: abspath of specfile
+    Parse the template specfile once, apply the common edits, and write the
+    result to every target, applying any per-target override first.
+
+    A target may be the template itself, in which case it is edited in place.
+
+    :param specfile_path: abspath of template specfile
     :type specfile_path: str or NoneType
-    :param ReleaseVersion release_version: release version to set in spec file
+    :param targets: map of target path to a per-target override
+    :type targets: dict of str * ((Specfile -> NoneType) or NoneType)
+    :param ReleaseVersion release_version: release version to set in spec files
     :param sources: local source files
     :type sources: list of str or NoneType
     :param arbitrary: a function that takes the spec and does some action
     :type arbitrary: Specfile -> NoneType
     """
-    if specfile_path is not None:
-        with specfile.Specfile(specfile_path) as spec:
-            if release_version is not None:
-                spec.version = str(release_version)
-                release = release_version.release()
-                if release is not None:
-                    spec.release = release
-            if sources is not None:
-                with spec.sources() as entries:
-                    for index, value in enumerate(sources):
-                        entries[index].location = value
-            if arbitrary is not None:
-                arbitrary(spec)
+    if specfile_path is None:
+        return
+
+    from specfile import specfile  # noqa: PLC0415
 
+    sourcedir = os.path.dirname(specfile_path)
 
-def get_python_package_info(name) -> tuple[Version, Any]:
+    with open(specfile_path, encoding="utf-8") as file:
+        spec = specfile.Specfile(content=file.read(), sourcedir=sourcedir)
+
+    _apply_specfile_edits(
+        spec,
+        version=None if release_version is None else str(release_version),
+        release=None if release_version is None else release_version.release(),
+        sources=sources,
+        arbitrary=arbitrary,
+    )
+    rendered = str(spec)
+
+    # Overrides are applied serially, as rpm keeps its macro state globally.
+    contents = {}
+    for target, override in targets.items():
+        if override is None:
+            contents[target] = rendered
+        else:
+            target_spec = specfile.Specfile(content=rendered, sourcedir=sourcedir)
+            override(target_spec)
+            contents[target] = str(target_spec)
+
+    def write(target):
+        with open(target, "w", encoding="utf-8") as file:
+            file.write(contents[target])
+
+    with ThreadPoolExecutor() as executor:
+        for future in [executor.submit(write, target) for target in contents]:
+            future.result()
+
+
+def get_python_package_info(name) -> tuple["Version", Any]:
     """
     Get info about the python package.
 
     :param str name: the project name
     :returns: Version * ParseResult
     """
+    from semantic_version import Version  # noqa: PLC0415
+
     command = ["python3", "setup.py", "--name"]
     with subprocess.Popen(command, stdout=subprocess.PIPE) as proc:
         stdout = proc.stdout
@@ -136,7 +210,7 @@ def get_python_package_info(name) -> tuple[Version, Any]:
     return (release_version, github_repo)
 
 
-def get_package_info(manifest_abs_path, package_name) -> tuple[Version, Any]:
+def get_package_info(manifest_abs_path, package_name) -> tuple["Version", Any]:
     """
     Extract the version string and repo URL from Cargo.toml and return it.
 
@@ -145,6 +219,8 @@ def get_package_info(manifest_abs_path, package_name) -> tuple[Version, Any]:
     :returns: stratisd version string and repository URL
     :rtype: Version * ParseResult
     """
+    from semantic_version import Version  # noqa: PLC0415
+
     assert os.path.isabs(manifest_abs_path)
 
     with open(manifest_abs_path, "rb") as manifest:
@@ -204,12 +280,167 @@ def get_branch():
     return branch_str.decode("utf-8").rstrip()
 
 
+def _existing_assets(session, assets_url):
+    """
+    Get the assets already attached to a release.
+
+    :param session: session to make requests with
+    :param str assets_url: API URL that lists the release's assets
+    :returns: map of asset name to asset information
+    :rtype: dict of str * dict
+    """
+    existing = {}
+    page = 1
+    while True:
+        response = session.get(
+            assets_url, params={"per_page": 100, "page": page}, timeout=_UPLOAD_TIMEOUT
+        )
+        response.raise_for_status()
+        entries = response.json()
+        if not entries:
+            return existing
+        existing.update((entry["name"], entry) for entry in entries)
+        page += 1
+
+
+def _retryable(err):
+    """
+    Whether a request which failed may succeed if it is made again, i.e.,
+    whether the connection failed or timed out, or the server failed.
+
+    :param err: the error the request failed with
+    :type err: requests.RequestException
+    :rtype: bool
+    """
+    import requests  # noqa: PLC0415
+
+    if isinstance(err, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return (
+        isinstance(err, requests.HTTPError)
+        and err.response is not None
+        and err.response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+    )
+
+
+def _upload_one(session, upload_url, assets_url, asset, existing):
+    """
+    Upload a single asset, retrying with exponential backoff if the
+    connection fails or times out, or the server fails.
+
+    An asset with the same name which is not complete or whose size differs
+    is deleted before the upload. A failed upload may leave a partial asset
+    with the name, which is deleted before the upload is retried.
+
+    :param session: session to make requests with
+    :param str upload_url: URL to upload assets to
+    :param str assets_url: API URL that lists the release's assets
+    :param str asset: path to the asset
+    :param existing: assets already attached to the release
+    :type existing: dict of str * dict
+    :returns: the number of bytes uploaded and the time it took
+    :rtype: int * float
+    """
+    import requests  # noqa: PLC0415
+
+    name = os.path.basename(asset)
+    size = os.path.getsize(asset)
+
+    previous = existing.get(name)
+    if previous is not None:
+        if previous.get("state", "uploaded") == "uploaded" and previous["size"] == size:
+            return (0, 0.0)
+        session.delete(previous["url"], timeout=_UPLOAD_TIMEOUT).raise_for_status()
+
+    attempt = 0
+    while True:
+        try:
+            if attempt > 0:
+                partial = _existing_assets(session, assets_url).get(name)
+                if partial is not None:
+                    session.delete(
+                        partial["url"], timeout=_UPLOAD_TIMEOUT
+                    ).raise_for_status()
+
+            start = time.monotonic()
+            with open(asset, "rb") as file:
+                response = session.post(
+                    upload_url,
+                    params={"name": name, "label": asset},
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "Content-Length": str(size),
+                    },
+                    data=file,
+                    timeout=_UPLOAD_TIMEOUT,
+                )
+            response.raise_for_status()
+            return (size, time.monotonic() - start)
+        except requests.RequestException as err:
+            attempt += 1
+            if attempt == _UPLOAD_RETRIES or not _retryable(err):
+                raise RuntimeError(f"Failed to upload asset {asset}: {err}") from err
+            time.sleep(_UPLOAD_BACKOFF ** (attempt - 1))
+
+
+def upload_assets(upload_url, assets_url, api_key, assets, *, workers=_UPLOAD_WORKERS):
+    """
+    Upload assets to a release concurrently, over a shared connection pool.
+
+    Assets which are already attached to the release, with a matching name
+    and size, are skipped, so that an interrupted upload may be rerun.
+
+    :param str upload_url: URL to upload assets to, may be a URI template
+    :param str assets_url: API URL that lists the release's assets
+    :param str api_key: GitHub API key
+    :param assets: paths to the assets to upload
+    :type assets: list of str
+    :param int workers: the maximum number of concurrent uploads
+    """
+    import requests  # noqa: PLC0415
+    from requests.adapters import HTTPAdapter  # noqa: PLC0415
+
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(
+            {
+                "Authorization": f"token {api_key}",
+                "Accept": "application/vnd.github+json",
+            }
+        )
+
+        existing = _existing_assets(session, assets_url)
+        upload_url = upload_url.split("{?")[0]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                asset: executor.submit(
+                    _upload_one, session, upload_url, assets_url, asset, existing
+                )
+                for asset in assets
+            }
+            for asset, future in futures.items():
+                (size, elapsed) = future.result()
+                if size == 0:
+                    print(f"{asset}: already uploaded, skipping")
+                else:
+                    print(
+                        f"{asset}: {size} bytes in {elapsed:.1f} s "
+                        f"({size / 2**20 / max(elapsed, 1e-6):.2f} MiB/s)"
+                    )
+
+
 def create_release(
     repository, tag, release_version, changelog_url, *, additional_assets=None
 ):
     """
     Create draft release from a pre-established GitHub tag for this repository.
 
+    If a draft release for the tag already exists, it is reused, and only
+    the assets which are missing from it are uploaded.
+
     :param ParseResult repository: Git repository
     :param str tag: release tag
     :param str release_version: release version
@@ -218,6 +449,8 @@ def create_release(
     :type additional_assets: (list of str) or None
     :return: GitHub release object
     """
+    from github import Github  # noqa: PLC0415
+
     api_key = os.environ.get("GITHUB_API_KEY")
     if api_key is None:
         api_key = getpass("API key: ")
@@ -226,12 +459,23 @@ def create_release(
 
     repo = git.get_repo(repository.path.strip("/"))
 
-    release = repo.create_git_release(
-        tag, f"Version {release_version}", f"See {changelog_url}", draft=True
+    release = next(
+        (
+            release
+            for release in repo.get_releases()
+            if release.draft and release.tag_name == tag
+        ),
+        None,
     )
+    if release is None:
+        release = repo.create_git_release(
+            tag, f"Version {release_version}", f"See {changelog_url}", draft=True
+        )
 
-    for asset in [] if additional_assets is None else additional_assets:
-        release.upload_asset(asset, label=asset)
+    if additional_assets:
+        upload_assets(
+            release.upload_url, release.assets_url, api_key, additional_assets
+        )
 
     return release
 
@@ -331,6 +575,8 @@ def get_changelog_url(repository_url, branch):
     :param str repository_url: object representing the GitHub repo
     :param str branch: the git branch
     """
+    import requests  # noqa: PLC0415
+
     changelog_url = f"{repository_url}/blob/{branch}/CHANGES.txt"
     requests_var = requests.get(changelog_url, timeout=30)
     if requests_var.status_code != requests.codes.ok:
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Check the import time of the release management entry points.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ENTRY_POINTS = ["create_artifacts", "create_release"]
+
+# Modules which must not be loaded just by importing an entry point.
+DEFERRED_MODULES = ["github", "requests", "semantic_version", "specfile"]
+
+_BUDGET_DEFAULT = 100
+
+
+def import_times(module_name):
+    """
+    Import a module in a fresh interpreter and report its import times.
+
+    :param str module_name: the name of the module to import
+    :returns: cumulative import time of the module in us and the names of
+        all modules imported along with it
+    :rtype: int * (set of str)
+    """
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module_name}"]
+    result = subprocess.run(
+        command,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    (total, names) = (None, set())
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        (_, cumulative, name) = line.removeprefix("import time:").split("|")
+        if cumulative.strip() == "cumulative":
+            continue
+        names.add(name.strip())
+        if name.strip() == module_name:
+            total = int(cumulative)
+
+    assert total is not None, f"no import time reported for {module_name}"
+    return (total, names)
+
+
+def main():
+    """
+    Main function
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure the import time of each release management entry point "
+            "using '-X importtime'. Fail if an entry point exceeds the budget "
+            "or loads a module that should only be loaded on demand."
+        )
+    )
+    parser.add_argument(
+        "--budget",
+        action="store",
+        default=_BUDGET_DEFAULT,
+        help=f"import time budget in ms (default is {_BUDGET_DEFAULT})",
+        type=int,
+    )
+    parser.add_argument(
+        "--repeat",
+        action="store",
+        default=3,
+        help="number of measurements per entry point, the minimum is used",
+        type=int,
+    )
+    namespace = parser.parse_args()
+
+    failed = False
+    for entry_point in ENTRY_POINTS:
+        measurements = [import_times(entry_point) for _ in range(namespace.repeat)]
+        total_ms = min(total for (total, _) in measurements) / 1000
+        deferred = sorted(
+            name for name in DEFERRED_MODULES if name in measurements[0][1]
+        )
+
+        print(f"{entry_point}: {total_ms:.1f} ms (budget {namespace.budget} ms)")
+        if total_ms > namespace.budget:
+            print(f"{entry_point}: import time exceeds budget")
+            failed = True
+        if deferred:
+            print(f"{entry_point}: loaded at import: {', '.join(deferred)}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
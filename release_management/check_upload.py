@@ -0,0 +1,327 @@
+#!/usr/bin/python3
+#
+# Copyright 2026 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Check the retries of release asset uploads against a stand-in server.
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from _utils import _UPLOAD_RETRIES, upload_assets
+
+_ASSET_SIZE = 100000
+
+# Each case is a description; how the server fails an upload: "5xx" with a
+# server error, "drop" by closing the connection, "401" as unauthorized;
+# how many uploads it fails; the assets already attached to the release, by
+# name, with their state and whether their size is that of the asset;
+# whether the upload should fail; and the requests the server should get for
+# the assets x and y, in order, where "GET" is a listing of the assets.
+CASES = [
+    (
+        "server error, then success",
+        "5xx",
+        2,
+        {},
+        False,
+        [
+            "GET",
+            "POST x",
+            "GET",
+            "DELETE x",
+            "POST x",
+            "GET",
+            "DELETE x",
+            "POST x",
+            "POST y",
+        ],
+    ),
+    (
+        "connection dropped, then success",
+        "drop",
+        1,
+        {},
+        False,
+        ["GET", "POST x", "GET", "DELETE x", "POST x", "POST y"],
+    ),
+    (
+        "unauthorized, which is not retried",
+        "401",
+        1,
+        {},
+        True,
+        ["GET", "POST x", "POST y"],
+    ),
+    (
+        "server error on every attempt",
+        "5xx",
+        _UPLOAD_RETRIES,
+        {},
+        True,
+        ["GET", "POST x"]
+        + ["GET", "DELETE x", "POST x"] * (_UPLOAD_RETRIES - 1)
+        + ["POST y"],
+    ),
+    (
+        "asset already uploaded, or partly uploaded",
+        None,
+        0,
+        {"x": ("uploaded", True), "y": ("starter", False)},
+        False,
+        ["GET", "DELETE y", "POST y"],
+    ),
+    (
+        "asset already uploaded with another size",
+        None,
+        0,
+        {"x": ("uploaded", False)},
+        False,
+        ["GET", "DELETE x", "POST x", "POST y"],
+    ),
+]
+
+
+class _Release:
+    """
+    The assets of the stand-in release, how the server is to fail, and the
+    requests it got.
+    """
+
+    def __init__(self, base, failure, failures, assets):
+        """
+        Initializer.
+
+        :param str base: the URL of the server
+        :param failure: how the server fails an upload, or None
+        :type failure: str or NoneType
+        :param int failures: how many uploads the server fails
+        :param assets: map of asset name to its information
+        :type assets: dict of str * dict
+        """
+        self.base = base
+        self.failure = failure
+        self.failures = failures
+        self.assets = assets
+        self.ids = itertools.count(len(assets) + 1)
+        self.requests = []
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Handles the requests that upload_assets makes, as GitHub does.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # The release the server stands in for, set for each case
+    release: _Release
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _reply(self, status, body=None):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802
+        """
+        List the release's assets.
+        """
+        release = self.release
+        page = parse_qs(urlsplit(self.path).query)["page"]
+        with release.lock:
+            if page == ["1"]:
+                release.requests.append("GET")
+            self._reply(
+                HTTPStatus.OK, list(release.assets.values()) if page == ["1"] else []
+            )
+
+    def do_DELETE(self):  # noqa: N802
+        """
+        Delete an asset.
+        """
+        release = self.release
+        asset_id = int(self.path.rsplit("/", 1)[1])
+        with release.lock:
+            name = next(
+                name
+                for (name, asset) in release.assets.items()
+                if asset["id"] == asset_id
+            )
+            del release.assets[name]
+            release.requests.append(f"DELETE {name}")
+        self._reply(HTTPStatus.NO_CONTENT)
+
+    def do_POST(self):  # noqa: N802
+        """
+        Upload an asset, leaving a partial asset if the upload fails.
+        """
+        release = self.release
+        name = parse_qs(urlsplit(self.path).query)["name"][0]
+        length = int(self.headers["Content-Length"])
+        with release.lock:
+            release.requests.append(f"POST {name}")
+            fail = release.failures > 0
+            if fail:
+                release.failures -= 1
+
+        if fail and release.failure == "401":
+            self.rfile.read(length)
+            self._reply(HTTPStatus.UNAUTHORIZED, {"message": "Bad credentials"})
+            return
+
+        if name in release.assets:
+            self.rfile.read(length)
+            self._reply(HTTPStatus.UNPROCESSABLE_ENTITY, {"message": "already_exists"})
+            return
+
+        asset_id = next(release.ids)
+        url = f"{release.base}/assets/{asset_id}"
+        received = len(self.rfile.read(length // 2 if fail else length))
+        release.assets[name] = {
+            "id": asset_id,
+            "name": name,
+            "url": url,
+            "state": "starter" if fail else "uploaded",
+            "size": received,
+        }
+
+        if not fail:
+            self._reply(HTTPStatus.CREATED, release.assets[name])
+        elif release.failure == "drop":
+            self.close_connection = True
+        else:
+            self.rfile.read(length - received)
+            self._reply(HTTPStatus.BAD_GATEWAY, {"message": "Bad gateway"})
+
+
+def _run_case(directory, failure, failures, existing):
+    """
+    Upload the assets x and y to a stand-in server.
+
+    :param str directory: the directory the assets are in
+    :param failure: how the server fails an upload, or None
+    :type failure: str or NoneType
+    :param int failures: how many uploads the server fails
+    :param existing: the assets already attached to the release
+    :type existing: dict of str * (str * bool)
+    :returns: whether the upload failed, the requests made, and the assets
+        attached to the release afterwards
+    :rtype: bool * (list of str) * (dict of str * dict)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    base = f"http://127.0.0.1:{server.server_port}"
+    release = _Release(
+        base,
+        failure,
+        failures,
+        {
+            name: {
+                "id": asset_id,
+                "name": name,
+                "url": f"{base}/assets/{asset_id}",
+                "state": state,
+                "size": _ASSET_SIZE if complete else _ASSET_SIZE // 2,
+            }
+            for (asset_id, (name, (state, complete))) in enumerate(
+                existing.items(), start=1
+            )
+        },
+    )
+    _Handler.release = release
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+
+    try:
+        with mock.patch("time.sleep"), contextlib.redirect_stdout(io.StringIO()):
+            upload_assets(
+                f"{base}/upload{{?name,label}}",
+                f"{base}/assets",
+                "key",
+                [os.path.join(directory, name) for name in ("x", "y")],
+                workers=1,
+            )
+        failed = False
+    except RuntimeError:
+        failed = True
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return (failed, release.requests, release.assets)
+
+
+def main():
+    """
+    Main function
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Upload release assets to a stand-in server that fails some "
+            "uploads, leaving partial assets. Fail if a partial asset is not "
+            "deleted before an upload is retried, if a failure is retried "
+            "which is not a connection or server failure, or if an asset "
+            "already uploaded is uploaded again."
+        )
+    )
+    parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("x", "y"):
+            with open(os.path.join(directory, name), "wb") as file:
+                file.write(os.urandom(_ASSET_SIZE))
+
+        for description, failure, failures, existing, error, expected in CASES:
+            (upload_failed, requests, assets) = _run_case(
+                directory, failure, failures, existing
+            )
+            complete = error or all(
+                asset["state"] == "uploaded" and asset["size"] == _ASSET_SIZE
+                for asset in assets.values()
+            )
+            ok = upload_failed == error and requests == expected and complete
+            print(f"{'ok' if ok else 'FAILED'}: {description}")
+            if not ok:
+                print(f"    upload failed: {upload_failed}, expected {error}")
+                print(f"    requests: {', '.join(requests)}")
+                print(f"    expected: {', '.join(expected)}")
+                print(f"    assets: {assets}")
+            failed = failed or not ok
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,7 +24,7 @@ import sys
 from _utils import (
     MANIFEST_PATH,
     ReleaseVersion,
-    edit_specfile,
+    edit_specfiles,
     get_package_info,
     get_python_package_info,
     make_source_tarball,
@@ -58,6 +58,17 @@ def main():
         help="path to specfile to edit",
         type=lambda p: p if p is None else os.path.abspath(p),
     )
+    parser.add_argument(
+        "--specfile-target",
+        action="append",
+        default=[],
+        dest="specfile_targets",
+        help=(
+            "additional path to write the edited specfile to; may be "
+            "specified multiple times"
+        ),
+        type=os.path.abspath,
+    )
 
     pre_or_post = parser.add_mutually_exclusive_group(required=False)
     pre_or_post.add_argument(
@@ -117,7 +128,9 @@ def _stratisd_artifacts(namespace):
     (source_version, _) = get_package_info(manifest_abs_path, "stratisd")
 
     specfile_path = namespace.specfile_path
-    if specfile_path is None and (namespace.pre_release or namespace.post_release):
+    if specfile_path is None and (
+        namespace.pre_release or namespace.post_release or namespace.specfile_targets
+    ):
         raise RuntimeError("must specify specfile using --specfile-path option")
 
     release_version = ReleaseVersion(
@@ -137,8 +150,9 @@ def _stratisd_artifacts(namespace):
 
     os.rename(vendor_tarfile_name, vendor_tarfile_path)
 
-    edit_specfile(
+    edit_specfiles(
         specfile_path,
+        dict.fromkeys([specfile_path] + namespace.specfile_targets),
         release_version=release_version,
         sources=[
             os.path.basename(path)
@@ -158,7 +172,9 @@ def _stratis_cli_artifacts(namespace):
 
     specfile_path = namespace.specfile_path
 
-    if specfile_path is None and (namespace.pre_release or namespace.post_release):
+    if specfile_path is None and (
+        namespace.pre_release or namespace.post_release or namespace.specfile_targets
+    ):
         raise RuntimeError("must specify specfile using --specfile-path option")
 
     release_version = ReleaseVersion(
@@ -184,8 +200,9 @@ def _stratis_cli_artifacts(namespace):
             if index is not None:
                 del tags[index]
 
-    edit_specfile(
+    edit_specfiles(
         specfile_path,
+        dict.fromkeys([specfile_path] + namespace.specfile_targets),
         release_version=release_version,
         sources=[os.path.basename(source_tarfile)],
         arbitrary=remove_stratisd_requires,
@@ -20,7 +20,6 @@ Make a GitHub Draft release.
 import argparse
 import os
 import subprocess
-from unittest.mock import patch
 
 from _utils import (
     MANIFEST_PATH,
@@ -48,6 +47,8 @@ def _with_dry_run(dry_run):
 
         :param str to_patch_str: the string that identifies the method
         """
+        # unittest.mock pulls in asyncio, so only import it for a dry run.
+        from unittest.mock import patch  # noqa: PLC0415
 
         def side_effect(name):
             """